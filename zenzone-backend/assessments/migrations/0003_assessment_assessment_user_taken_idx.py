@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 12:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_rename_assessmentresult_assessment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['user', '-date_taken'], name='assessment_user_taken_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-17 12:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_date_taken(apps, schema_editor):
+    # Existing assessments were never edited
+    Assessment = apps.get_model('assessments', 'Assessment')
+    Assessment.objects.update(updated_at=F('date_taken'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_assessment_assessment_user_taken_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_date_taken, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['user', 'updated_at'], name='assessment_user_updated_idx'),
+        ),
+    ]
@@ -10,6 +10,7 @@ class Assessment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     assessment_type = models.CharField(max_length=4, choices=ASSESSMENT_TYPES)
     date_taken = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # MDQ specific fields
     mdq_yes_answers = models.IntegerField(null=True, blank=True)
@@ -22,6 +23,10 @@ class Assessment(models.Model):
 
     class Meta:
         ordering = ['-date_taken']
+        indexes = [
+            models.Index(fields=['user', '-date_taken'], name='assessment_user_taken_idx'),
+            models.Index(fields=['user', 'updated_at'], name='assessment_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s {self.assessment_type} on {self.date_taken.strftime('%Y-%m-%d')}"
\ No newline at end of file
@@ -7,6 +7,6 @@ class AssessmentSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'assessment_type', 'date_taken',
             'mdq_yes_answers', 'mdq_same_time_period', 'mdq_problem_level',
-            'bsds_checked_statements', 'bsds_story_fit'
+            'bsds_checked_statements', 'bsds_story_fit', 'updated_at'
         ]
-        read_only_fields = ['date_taken']
\ No newline at end of file
+        read_only_fields = ['date_taken', 'updated_at']
\ No newline at end of file
@@ -1,3 +1,44 @@
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from .models import Assessment
+
+
+class AssessmentHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='history@example.com', username='history', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_history_pages(self):
+        Assessment.objects.bulk_create(Assessment(user=self.user, assessment_type='MDQ') for _ in range(3))
+        expected = list(Assessment.objects.filter(user=self.user).order_by('-date_taken', '-id').values_list('id', flat=True))
+
+        ids, url = [], '/api/assessments/history/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/assessments/history/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN output checked against PostgreSQL plans")
+class AssessmentIndexTests(TestCase):
+    def test_listing_uses_user_date_index(self):
+        user = User.objects.create_user(email='indexed@example.com', username='indexed', password='pw')
+        Assessment.objects.bulk_create(Assessment(user=user, assessment_type='MDQ') for _ in range(50))
+        with connection.cursor() as cursor:
+            # Tiny test tables would otherwise always be read sequentially
+            cursor.execute('SET LOCAL enable_seqscan = off')
 
-# Create your tests here.
+        plan = Assessment.objects.filter(user=user).order_by('-date_taken').explain()
+        self.assertIn('assessment_user_taken_idx', plan)
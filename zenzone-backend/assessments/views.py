@@ -1,9 +1,14 @@
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Assessment
 from .serializers import AssessmentSerializer
+from zenzone_backend.pagination import DateTakenCursorPagination
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AssessmentHistoryView(APIView):
     permission_classes = [IsAuthenticated]
@@ -11,10 +16,15 @@ class AssessmentHistoryView(APIView):
     def get(self, request):
         try:
             assessments = Assessment.objects.filter(user=request.user)
-            serializer = AssessmentSerializer(assessments, many=True)
-            return Response(serializer.data)
+            paginator = DateTakenCursorPagination()
+            page = paginator.paginate_queryset(assessments, request, view=self)
+            serializer = AssessmentSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound:
+            # Invalid cursor
+            raise
         except Exception as e:
-            print(f"Error in assessment history: {str(e)}")  # Debug log
+            logger.exception("Error in assessment history")
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -25,15 +35,15 @@ class SaveAssessmentView(APIView):
 
     def post(self, request):
         try:
-            print("Received data:", request.data)  # Debug print
+            logger.debug("Saving assessment for user %s", request.user.pk)
             serializer = AssessmentSerializer(data=request.data)
             if serializer.is_valid():
                 serializer.save(user=request.user)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
-            print("Serializer errors:", serializer.errors)  # Debug print
+            logger.info("Invalid assessment from user %s: %s", request.user.pk, serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print("Error saving assessment:", str(e))  # Debug print
+            logger.exception("Error saving assessment")
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,30 @@
+# gunicorn -c gunicorn.conf.py zenzone_backend.wsgi
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+# Threaded workers keep several requests in flight per process, which is what
+# lets the sentiment batch scheduler coalesce concurrent saves
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Load Django, and with it the fp32 sentiment model, once in the master
+# process so forked workers share the weights copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    from journal_sentiment.service import preload
+
+    preload()
+    # Keep the garbage collector from touching (and so copying) the
+    # preloaded objects in every worker
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from journal_sentiment.service import preload
+
+    # Quantized and onnx models aren't fork-safe, so each worker loads its own
+    preload(forked=True)
@@ -1,93 +1,99 @@
-from django.db.models import Count
-from django.db.models.functions import TruncDate, TruncHour
+from django.db.models import Sum
 from datetime import datetime, timedelta
 from django.utils import timezone
+from .models import SentimentRollup
+from .rollups import buckets
 
-def get_sentiment_summary(user, timeframe='weekly'):
-    if timeframe == 'daily':
-        start_date = timezone.now() - timedelta(days=1)
-    elif timeframe == 'weekly':
-        start_date = timezone.now() - timedelta(days=7)
-    else:  # monthly
-        start_date = timezone.now() - timedelta(days=30)
+# Analytics read the per-user rollups (see journal.rollups) rather than the
+# raw entries: hourly buckets for the daily view, daily buckets otherwise.
+# Windows start at the bucket containing now - timeframe.
+TIMEFRAMES = {
+    'daily': ('hour', timedelta(days=1)),
+    'weekly': ('day', timedelta(days=7)),
+    'monthly': ('day', timedelta(days=30)),
+}
+
+SENTIMENTS = ('positive', 'neutral', 'negative')
+
+def window_start(timeframe='weekly'):
+    granularity, span = TIMEFRAMES.get(timeframe, TIMEFRAMES['monthly'])
+    return buckets(timezone.now() - span)[granularity]
+
+def get_rollups(user, timeframe='weekly'):
+    granularity, _ = TIMEFRAMES.get(timeframe, TIMEFRAMES['monthly'])
+    return SentimentRollup.objects.filter(
+        user=user, granularity=granularity, bucket__gte=window_start(timeframe), count__gt=0
+    )
+
+def get_rows(user, timeframe='weekly'):
+    # The one query behind every analytics view: counts per bucket, sentiment and mood
+    return list(
+        get_rollups(user, timeframe)
+        .values('bucket', 'sentiment', 'mood')
+        .annotate(count=Sum('count'))
+        .order_by('bucket', 'sentiment', 'mood')
+    )
+
+def summarize(rows):
+    totals = dict.fromkeys(SENTIMENTS, 0)
+    for row in rows:
+        totals[row['sentiment']] = totals.get(row['sentiment'], 0) + row['count']
+    total_entries = sum(totals.values())
 
-    entries = user.journalentry_set.filter(created_at__gte=start_date)
-    total_entries = entries.count()
-    
-    if total_entries == 0:
-        return {'positive': 0, 'neutral': 0, 'negative': 0}
-    
-    sentiment_counts = entries.values('sentiment').annotate(count=Count('id'))
-    
     summary = {'positive': 0, 'neutral': 0, 'negative': 0}
-    for item in sentiment_counts:
-        percentage = (item['count'] / total_entries) * 100
-        summary[item['sentiment']] = round(percentage, 2)
-    
+    if total_entries == 0:
+        return summary
+    for sentiment, count in totals.items():
+        if count:
+            summary[sentiment] = round((count / total_entries) * 100, 2)
     return summary
 
-def get_sentiment_trends(user, timeframe='weekly'):
-    now = timezone.now()
-    
-    if timeframe == 'daily':
-        start_date = now - timedelta(days=1)
-        trunc_function = TruncHour
-        date_format = '%H:%M:%S%z'
-    elif timeframe == 'weekly':
-        start_date = now - timedelta(days=7)
-        trunc_function = TruncDate
-        date_format = '%Y-%m-%d'
-    else:  # monthly
-        start_date = now - timedelta(days=30)
-        trunc_function = TruncDate
-        date_format = '%Y-%m-%d'
-    
-    entries = user.journalentry_set.filter(
-        created_at__gte=start_date
-    ).annotate(
-        date=trunc_function('created_at')
-    ).values('date', 'sentiment').annotate(
-        count=Count('id')
-    ).order_by('date')
-    
+def trends(rows, timeframe='weekly'):
     trend_data = {}
-    for entry in entries:
+    for row in rows:
+        date = timezone.localtime(row['bucket'])
         if timeframe == 'daily':
             # For daily view, use the full datetime with timezone
-            date_str = entry['date'].isoformat()
+            date_str = date.isoformat()
         else:
-            date_str = entry['date'].strftime(date_format)
-            
+            date_str = date.strftime('%Y-%m-%d')
+
         if date_str not in trend_data:
             trend_data[date_str] = {'positive': 0, 'neutral': 0, 'negative': 0}
-        trend_data[date_str][entry['sentiment']] = entry['count']
-    
+        trend_data[date_str][row['sentiment']] = trend_data[date_str].get(row['sentiment'], 0) + row['count']
     return trend_data
 
-def get_mood_analysis(user, timeframe='weekly'):
-    if timeframe == 'daily':
-        start_date = timezone.now() - timedelta(days=1)
-        date_format = '%H:%M'
-    elif timeframe == 'weekly':
-        start_date = timezone.now() - timedelta(days=7)
-        date_format = '%Y-%m-%d'
-    else:
-        start_date = timezone.now() - timedelta(days=30)
-        date_format = '%Y-%m-%d'
-    
-    entries = user.journalentry_set.filter(created_at__gte=start_date)
-    
-    mood_counts = entries.values('mood').annotate(count=Count('id'))
-    
+def mood_analysis(rows, timeframe='weekly'):
+    date_format = '%H:%M' if timeframe == 'daily' else '%Y-%m-%d'
+    counts = {}
     mood_timeline = {}
-    for entry in entries.values('mood', 'created_at'):
-        mood = entry['mood']
-        timestamp = entry['created_at'].strftime(date_format)
-        if mood not in mood_timeline:
-            mood_timeline[mood] = []
-        mood_timeline[mood].append(timestamp)
-    
+    # One timestamp per entry, newest first, at the rollup's resolution
+    for row in reversed(rows):
+        mood = row['mood']
+        counts[mood] = counts.get(mood, 0) + row['count']
+        timestamp = timezone.localtime(row['bucket']).strftime(date_format)
+        mood_timeline.setdefault(mood, []).extend([timestamp] * row['count'])
+
     return {
-        'counts': list(mood_counts),
+        'counts': [{'mood': mood, 'count': count} for mood, count in counts.items()],
         'timeline': mood_timeline
-    }
\ No newline at end of file
+    }
+
+def get_analytics(user, timeframe='weekly'):
+    """Summary, trends and mood analysis for one timeframe from a single query."""
+    rows = get_rows(user, timeframe)
+    return {
+        'sentiment_summary': summarize(rows),
+        'sentiment_trends': trends(rows, timeframe),
+        'mood_analysis': mood_analysis(rows, timeframe),
+        'timeframe': timeframe
+    }
+
+def get_sentiment_summary(user, timeframe='weekly'):
+    return summarize(get_rows(user, timeframe))
+
+def get_sentiment_trends(user, timeframe='weekly'):
+    return trends(get_rows(user, timeframe), timeframe)
+
+def get_mood_analysis(user, timeframe='weekly'):
+    return mood_analysis(get_rows(user, timeframe), timeframe)
@@ -0,0 +1,53 @@
+"""
+Per-user analytics cache.
+
+Each user has a data version counter in the cache named by
+ANALYTICS_CACHE_ALIAS. Analytics responses are stored under keys that
+include it, so bumping the counter after any write to the user's entries
+(see journal.rollups.record_changes) invalidates them all at once.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    alias = settings.ANALYTICS_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _version_key(user_id):
+    return f"journal:data-version:{user_id}"
+
+
+def data_version(user_id, cache=None):
+    cache = cache or get_cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id):
+    cache = get_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        # Not set (or evicted): any fresh version invalidates what was cached
+        cache.set(_version_key(user_id), time.time_ns(), timeout=None)
+
+
+def analytics_key(user_id, version, timeframe, window_start):
+    # The window start is part of the key because entries age out of a timeframe
+    return f"journal:analytics:{user_id}:{version}:{timeframe}:{window_start:%Y%m%d%H}"
+
+
+def analytics_etag(key):
+    return hashlib.md5(key.encode()).hexdigest()
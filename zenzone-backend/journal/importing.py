@@ -0,0 +1,199 @@
+"""
+Bulk import of journal entries (POST /api/journal/entries/bulk/).
+
+Bodies are parsed incrementally from the request stream, either as a JSON
+array of objects or as NDJSON (one object per line), so a large import is
+never held in memory as raw text and parsed objects at the same time. The
+stream is read through LimitedReader, which caps the body size since the
+raw stream bypasses Django's DATA_UPLOAD_MAX_MEMORY_SIZE check.
+"""
+import codecs
+import json
+import logging
+
+from django.db import transaction
+
+from journal_sentiment.service import predict_batch
+from . import rollups
+from .models import JournalEntry
+from .serializers import JournalEntryImportSerializer
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+NDJSON_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/jsonlines')
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportTooLargeError(ImportFormatError):
+    pass
+
+
+class LimitedReader:
+    """Wraps a byte stream, raising ImportTooLargeError past `max_bytes`."""
+
+    def __init__(self, stream, max_bytes):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.total = 0
+
+    def read(self, size):
+        chunk = self.stream.read(size)
+        self.total += len(chunk)
+        if self.total > self.max_bytes:
+            raise ImportTooLargeError(f"Import body exceeds {self.max_bytes} bytes")
+        return chunk
+
+
+def iter_ndjson(stream, chunk_size=CHUNK_SIZE):
+    buffer = bytearray()
+    number = 0
+    eof = False
+    while not eof:
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        # Parse up to the last complete line; only the new chunk needs searching
+        newline = chunk.rfind(b'\n')
+        if eof:
+            end = len(buffer)
+        elif newline >= 0:
+            end = len(buffer) - len(chunk) + newline + 1
+        else:
+            continue
+        lines = bytes(buffer[:end]).split(b'\n')
+        del buffer[:end]
+        if not eof:
+            # The piece after the final newline is empty
+            lines.pop()
+        for line in lines:
+            number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ImportFormatError(f"Invalid JSON on line {number}")
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """Yield the items of a top-level JSON array, reading `stream` in chunks."""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        # Keep only the unparsed tail
+        buffer = buffer[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+
+    def next_char():
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                skip()
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return None
+            fill()
+
+    def skip():
+        nonlocal pos
+        pos += 1
+
+    try:
+        if next_char() != '[':
+            raise ImportFormatError("Expected a JSON array of entries")
+        skip()
+        index = 0
+        done = next_char() == ']'
+        while not done:
+            if next_char() is None:
+                raise ImportFormatError("Unexpected end of JSON array")
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                item, end = None, None
+            # An item reaching the end of the buffer may continue in the next chunk
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ImportFormatError(f"Invalid JSON in item {index}")
+                fill()
+                continue
+            yield item
+            pos = end
+            index += 1
+
+            separator = next_char()
+            if separator == ',':
+                skip()
+            elif separator == ']':
+                done = True
+            else:
+                raise ImportFormatError(f"Expected ',' or ']' after item {index - 1}")
+
+        # Past the closing bracket only whitespace may follow
+        skip()
+        if next_char() is not None:
+            raise ImportFormatError("Unexpected data after the JSON array")
+    except UnicodeDecodeError:
+        raise ImportFormatError("Body is not valid UTF-8")
+
+
+def parse_entries(stream, content_type, max_entries, max_bytes):
+    """Validate each item; returns (validated data, errors as {'index', 'errors'})."""
+    stream = LimitedReader(stream, max_bytes)
+    items = iter_ndjson(stream) if content_type in NDJSON_TYPES else iter_json_array(stream)
+
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        if index >= max_entries:
+            raise ImportFormatError(f"At most {max_entries} entries can be imported at once")
+        serializer = JournalEntryImportSerializer(data=item)
+        if serializer.is_valid():
+            valid.append(serializer.validated_data)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid, errors
+
+
+def import_entries(user, items, score=True):
+    """
+    Create entries from validated import data in one transaction. With
+    `score`, all texts are labelled by a single batched inference call;
+    otherwise they are saved as pending for the background scorer.
+    """
+    if score:
+        try:
+            results = predict_batch([item['content'] for item in items])
+        except Exception:
+            logger.exception("Error in sentiment analysis for %d imported entries", len(items))
+            results = [None] * len(items)
+        fields = [JournalEntry.sentiment_fields(result) for result in results]
+    else:
+        fields = [JournalEntry.pending_sentiment_fields()] * len(items)
+
+    entries = [
+        JournalEntry(user=user, content=item['content'], mood=item['mood'], **entry_fields)
+        for item, entry_fields in zip(items, fields)
+    ]
+    with transaction.atomic():
+        JournalEntry.objects.bulk_create(entries, batch_size=500)
+        # created_at is auto_now_add, so original timestamps are applied afterwards
+        backdated = []
+        for entry, item in zip(entries, items):
+            if item.get('created_at'):
+                entry.created_at = item['created_at']
+                backdated.append(entry)
+        if backdated:
+            JournalEntry.objects.bulk_update(backdated, ['created_at'], batch_size=500)
+        # bulk_create skips the model signals
+        rollups.record_changes([(None, rollups.entry_state(entry)) for entry in entries])
+    return entries
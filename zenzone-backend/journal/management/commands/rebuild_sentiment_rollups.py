@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from journal import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the hourly and daily sentiment/mood rollups used by the journal "
+        "analytics from the raw entries, e.g. after a bulk data fix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help="Only rebuild this user id (repeatable)"
+        )
+
+    def handle(self, *args, **options):
+        created = rollups.rebuild(options['users'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {created} rollup rows"))
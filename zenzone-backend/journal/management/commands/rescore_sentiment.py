@@ -0,0 +1,163 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from journal import rollups
+from journal.models import JournalEntry
+from journal_sentiment import pool, service
+
+SCORE_FIELDS = [
+    'sentiment', 'sentiment_status', 'sentiment_updated_at',
+    'sentiment_positive', 'sentiment_neutral', 'sentiment_negative',
+    'sentiment_confidence', 'sentiment_model_version', 'updated_at',
+]
+
+class Command(BaseCommand):
+    help = (
+        "Re-label journal entries with the current sentiment model. Entries are streamed "
+        "by id, scored in batches across a process pool and written back with bulk_update; "
+        "progress is checkpointed so an interrupted run can be resumed. Pending and failed "
+        "entries carry no model version, so this also recovers lost background jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Inference processes; 1 scores in this process"
+        )
+        parser.add_argument('--checkpoint', default='rescore_sentiment.checkpoint.json')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help="Continue after the last id recorded in --checkpoint"
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Rescore every entry, not only those from other model versions"
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.checkpoint = options['checkpoint']
+        workers = max(1, options['workers'])
+
+        version = service.get_model_version()
+
+        last_id = 0
+        processed = 0
+        if options['resume'] and os.path.exists(self.checkpoint):
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+            if state.get('model_version') == version and state.get('all') == options['all']:
+                last_id, processed = state['last_id'], state['processed']
+                self.stdout.write(f"Resuming after id {last_id} ({processed} entries done)")
+
+        queryset = JournalEntry.objects.all()
+        if not options['all']:
+            queryset = queryset.exclude(sentiment_model_version=version)
+
+        started = time.monotonic()
+        done_this_run = 0
+        batches = self.iter_batches(queryset, last_id)
+        if workers == 1:
+            # This process is the only one scoring, so under 'auto' it gets every core
+            service.configure_threads(processes=1)
+            scored = (
+                (batch, service.get_analyzer().predict_batch([text for _, text, _ in batch]))
+                for batch in batches
+            )
+        else:
+            scored = self.score_in_pool(batches, workers)
+
+        for batch, results in scored:
+            processed += self.write_batch(batch, results)
+            last_id = batch[-1][0]
+            done_this_run += len(batch)
+            self.save_checkpoint(last_id, processed, version, options['all'])
+            self.report(done_this_run, processed, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {done_this_run} entries in {elapsed:.1f}s "
+            f"({done_this_run / elapsed if elapsed else 0:.1f} entries/s), model {version}"
+        ))
+
+    def score_in_pool(self, batches, workers):
+        """Score batches across worker processes, yielding results in id order."""
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        # Spawned (not forked) so workers never share this process's DB connection
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=pool.init_worker, initargs=(threads,)
+        ) as executor:
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append((batch, executor.submit(pool.score_texts, [text for _, text, _ in batch])))
+                # Keep every worker busy while earlier results are written back
+                if len(in_flight) >= workers * 2:
+                    batch, future = in_flight.popleft()
+                    yield batch, future.result()
+            while in_flight:
+                batch, future = in_flight.popleft()
+                yield batch, future.result()
+
+    def iter_batches(self, queryset, last_id):
+        """Keyset pagination on id, so memory stays flat however many rows there are."""
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'content', 'updated_at')[:self.batch_size]
+            )
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            yield batch
+
+    def write_batch(self, batch, results):
+        # Skip entries edited while they were being scored; the edit re-scored them
+        current = {
+            row[0]: row[1:] for row in
+            JournalEntry.objects.filter(id__in=[entry_id for entry_id, _, _ in batch])
+            .values_list('id', 'updated_at', 'user_id', 'created_at', 'sentiment', 'mood')
+        }
+        entries = []
+        changes = []
+        now = timezone.now()
+        for (entry_id, _, updated_at), result in zip(batch, results):
+            if entry_id not in current or current[entry_id][0] != updated_at:
+                continue
+            # updated_at is bumped so delta sync clients pick up the new label
+            entry = JournalEntry(id=entry_id, updated_at=now, **JournalEntry.sentiment_fields(result))
+            entries.append(entry)
+            user_id, created_at, sentiment, mood = current[entry_id][1:]
+            changes.append(((user_id, created_at, sentiment, mood), (user_id, created_at, entry.sentiment, mood)))
+
+        # bulk_update skips the model signals, so rollups are adjusted here
+        with transaction.atomic():
+            JournalEntry.objects.bulk_update(entries, SCORE_FIELDS)
+            rollups.record_changes(changes)
+        return len(entries)
+
+    def save_checkpoint(self, last_id, processed, version, all_entries):
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({
+                'last_id': last_id, 'processed': processed,
+                'model_version': version, 'all': all_entries,
+            }, f)
+        os.replace(tmp, self.checkpoint)
+
+    def report(self, done, processed, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{done} entries this run, {processed} updated in total, "
+            f"{done / elapsed if elapsed else 0:.1f} entries/s"
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0002_alter_journalentry_sentiment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='complete', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-17 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0003_journalentry_sentiment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_model_version',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_negative',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_neutral',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='sentiment_positive',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
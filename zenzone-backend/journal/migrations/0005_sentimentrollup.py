@@ -0,0 +1,51 @@
+# Generated by Django 5.0 on 2026-10-17 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncHour
+
+
+def build_rollups(apps, schema_editor):
+    JournalEntry = apps.get_model('journal', 'JournalEntry')
+    SentimentRollup = apps.get_model('journal', 'SentimentRollup')
+    for granularity, truncate in (('hour', TruncHour), ('day', TruncDay)):
+        rows = (
+            JournalEntry.objects.order_by()
+            .annotate(bucket=truncate('created_at'))
+            .values('user_id', 'bucket', 'sentiment', 'mood')
+            .annotate(count=Count('id'))
+        )
+        SentimentRollup.objects.bulk_create(
+            (SentimentRollup(granularity=granularity, **row) for row in rows.iterator(chunk_size=2000)),
+            batch_size=2000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0004_journalentry_sentiment_scores'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentimentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('sentiment', models.CharField(max_length=10)),
+                ('mood', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='sentimentrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'granularity', 'bucket', 'sentiment', 'mood'), name='unique_sentiment_rollup'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-17 12:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0005_sentimentrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['user', '-created_at'], name='journal_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['user', 'created_at', 'sentiment', 'mood'], name='journal_user_range_cov_idx'),
+        ),
+    ]
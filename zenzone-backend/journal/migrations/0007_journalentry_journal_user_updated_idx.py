@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 12:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0006_journalentry_journal_user_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['user', 'updated_at'], name='journal_user_updated_idx'),
+        ),
+    ]
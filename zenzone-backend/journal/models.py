@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from authentication.models import User
 
 class JournalEntry(models.Model):
@@ -13,12 +14,113 @@ class JournalEntry(models.Model):
         ],
         default='neutral'
     )
+    # Scoring may be deferred to a background worker (SENTIMENT_ASYNC)
+    sentiment_status = models.CharField(
+        max_length=10,
+        choices=[
+            ('pending', 'Pending'),
+            ('complete', 'Complete'),
+            ('failed', 'Failed')
+        ],
+        default='complete'
+    )
+    sentiment_updated_at = models.DateTimeField(null=True, blank=True)
+    # Full softmax output of the model that produced `sentiment`
+    sentiment_positive = models.FloatField(null=True, blank=True)
+    sentiment_neutral = models.FloatField(null=True, blank=True)
+    sentiment_negative = models.FloatField(null=True, blank=True)
+    sentiment_confidence = models.FloatField(null=True, blank=True)
+    sentiment_model_version = models.CharField(max_length=64, blank=True, default='', db_index=True)
     mood = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Per-user listing, newest first
+            models.Index(fields=['user', '-created_at'], name='journal_user_created_idx'),
+            # Per-user time ranges read sentiment and mood from the index alone
+            models.Index(fields=['user', 'created_at', 'sentiment', 'mood'], name='journal_user_range_cov_idx'),
+            # Delta sync
+            models.Index(fields=['user', 'updated_at'], name='journal_user_updated_idx'),
+        ]
+
+    @staticmethod
+    def sentiment_fields(result):
+        """
+        Model field values for a SentimentAnalyzer result, or for a failed
+        scoring attempt when `result` is None.
+        """
+        if result is None:
+            # Clear the previous scores so they don't outlive the label, and
+            # the version so rescore_sentiment retries the entry
+            return {
+                'sentiment': 'neutral',
+                'sentiment_status': 'failed',
+                'sentiment_updated_at': timezone.now(),
+                'sentiment_positive': None,
+                'sentiment_neutral': None,
+                'sentiment_negative': None,
+                'sentiment_confidence': None,
+                'sentiment_model_version': '',
+            }
+        probs = result['probabilities']
+        return {
+            'sentiment': result['label'],
+            'sentiment_status': 'complete',
+            'sentiment_updated_at': timezone.now(),
+            'sentiment_positive': probs['positive'],
+            'sentiment_neutral': probs['neutral'],
+            'sentiment_negative': probs['negative'],
+            'sentiment_confidence': probs[result['label']],
+            'sentiment_model_version': result['model_version'],
+        }
+
+    @staticmethod
+    def pending_sentiment_fields():
+        """
+        Model field values for an entry waiting on the background scorer. The
+        model version is cleared so rescore_sentiment also picks the entry up
+        if its queued job is lost (e.g. the worker restarted).
+        """
+        return {
+            'sentiment_status': 'pending',
+            'sentiment_positive': None,
+            'sentiment_neutral': None,
+            'sentiment_negative': None,
+            'sentiment_confidence': None,
+            'sentiment_model_version': '',
+        }
+
+    def __str__(self):
+        return f"{self.user.username}'s entry on {self.created_at.strftime('%Y-%m-%d')}"
+
+class SentimentRollup(models.Model):
+    """
+    Per-user count of entries by sentiment and mood for one hour or day,
+    kept up to date by journal.rollups so analytics never scan raw entries.
+    """
+    GRANULARITIES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    granularity = models.CharField(max_length=4, choices=GRANULARITIES)
+    # Start of the hour or day, in the project time zone
+    bucket = models.DateTimeField()
+    sentiment = models.CharField(max_length=10)
+    mood = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'granularity', 'bucket', 'sentiment', 'mood'],
+                name='unique_sentiment_rollup'
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.user.username}'s entry on {self.created_at.strftime('%Y-%m-%d')}"
\ No newline at end of file
+        return f"{self.user.username} {self.granularity} {self.bucket:%Y-%m-%d %H:%M} {self.sentiment}/{self.mood}: {self.count}"
@@ -0,0 +1,100 @@
+"""
+Incremental maintenance of SentimentRollup.
+
+Every write that changes an entry's sentiment or mood, or creates or deletes
+an entry, turns into +1/-1 deltas on the hour and day buckets it falls in.
+Model saves and deletes are handled by the signals in journal.signals; code
+that writes with QuerySet.update/bulk_update/bulk_create must call
+`record_changes` itself. Affected users' analytics caches are invalidated
+once the transaction commits.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import JournalEntry, SentimentRollup
+
+TRUNCATE = {'hour': TruncHour, 'day': TruncDay}
+
+
+def buckets(created_at):
+    local = timezone.localtime(created_at)
+    hour = local.replace(minute=0, second=0, microsecond=0)
+    return {'hour': hour, 'day': hour.replace(hour=0)}
+
+
+def entry_state(entry):
+    """What the rollups know about an entry: (user_id, created_at, sentiment, mood)."""
+    return (entry.user_id, entry.created_at, entry.sentiment, entry.mood)
+
+
+def record_changes(changes):
+    """
+    Apply a batch of entry changes, each an (old_state, new_state) pair of
+    `entry_state` tuples; None stands for a created or deleted entry.
+    """
+    deltas = Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            user_id, created_at, sentiment, mood = state
+            for granularity, bucket in buckets(created_at).items():
+                deltas[(user_id, granularity, bucket, sentiment, mood)] += sign
+
+    user_ids = set()
+    for (user_id, granularity, bucket, sentiment, mood), delta in deltas.items():
+        if delta:
+            _apply(user_id, granularity, bucket, sentiment, mood, delta)
+            user_ids.add(user_id)
+
+    for user_id in user_ids:
+        transaction.on_commit(lambda user_id=user_id: bump_data_version(user_id))
+
+
+def record_change(old, new):
+    record_changes([(old, new)])
+
+
+def _apply(user_id, granularity, bucket, sentiment, mood, delta):
+    key = dict(user_id=user_id, granularity=granularity, bucket=bucket, sentiment=sentiment, mood=mood)
+    if SentimentRollup.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            SentimentRollup.objects.create(count=delta, **key)
+    except IntegrityError:
+        # Another request created the row first
+        SentimentRollup.objects.filter(**key).update(count=F('count') + delta)
+
+
+def rebuild(user_ids=None):
+    """Recompute rollups from the raw entries, for all users or only `user_ids`."""
+    entries = JournalEntry.objects.order_by()
+    rollups = SentimentRollup.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        rollups.delete()
+        created = 0
+        for granularity, truncate in TRUNCATE.items():
+            rows = (
+                entries.annotate(bucket=truncate('created_at'))
+                .values('user_id', 'bucket', 'sentiment', 'mood')
+                .annotate(count=Count('id'))
+            )
+            created += len(SentimentRollup.objects.bulk_create(
+                (SentimentRollup(granularity=granularity, **row) for row in rows.iterator(chunk_size=2000)),
+                batch_size=2000
+            ))
+        for user_id in (user_ids if user_ids is not None else entries.values_list('user_id', flat=True).distinct()):
+            transaction.on_commit(lambda user_id=user_id: bump_data_version(user_id))
+    return created
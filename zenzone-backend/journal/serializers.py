@@ -1,8 +1,32 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import JournalEntry
 
 class JournalEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = JournalEntry
-        fields = ['id', 'content', 'sentiment', 'mood', 'created_at', 'updated_at']
-        read_only_fields = ['sentiment', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = [
+            'id', 'content', 'sentiment', 'sentiment_status', 'sentiment_updated_at',
+            'sentiment_positive', 'sentiment_neutral', 'sentiment_negative',
+            'sentiment_confidence', 'sentiment_model_version',
+            'mood', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'sentiment', 'sentiment_status', 'sentiment_updated_at',
+            'sentiment_positive', 'sentiment_neutral', 'sentiment_negative',
+            'sentiment_confidence', 'sentiment_model_version',
+            'created_at', 'updated_at'
+        ]
+
+class JournalEntryImportSerializer(serializers.ModelSerializer):
+    # Imported entries may keep the date they were originally written
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = JournalEntry
+        fields = ['content', 'mood', 'created_at']
+
+    def validate_created_at(self, value):
+        if value > timezone.now():
+            raise serializers.ValidationError("Date cannot be in the future.")
+        return value
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import rollups
+from .models import JournalEntry
+
+
+@receiver(pre_save, sender=JournalEntry)
+def remember_rollup_state(sender, instance, raw=False, **kwargs):
+    # The state the rollups currently count this entry under, if it exists yet
+    instance._rollup_state = None
+    if not raw and not instance._state.adding:
+        instance._rollup_state = (
+            JournalEntry.objects.filter(pk=instance.pk)
+            .values_list('user_id', 'created_at', 'sentiment', 'mood')
+            .first()
+        )
+
+
+@receiver(post_save, sender=JournalEntry)
+def update_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    rollups.record_change(getattr(instance, '_rollup_state', None), rollups.entry_state(instance))
+
+
+@receiver(post_delete, sender=JournalEntry)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    rollups.record_change(rollups.entry_state(instance), None)
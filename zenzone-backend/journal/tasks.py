@@ -0,0 +1,54 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from . import rollups
+from .models import JournalEntry
+
+logger = logging.getLogger(__name__)
+
+# Results are written back off the scheduler's inference thread, so a slow
+# row lock or rollup update never holds up the next batch
+_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sentiment-writeback')
+
+
+def enqueue_sentiment_scoring(entry, scheduler):
+    """
+    Score an already-saved entry in the background and write the label back.
+    The entry should have been saved with JournalEntry.pending_sentiment_fields().
+    Jobs live in this process only; entries whose job is lost stay pending
+    until rescore_sentiment scores them.
+    """
+    entry_id = entry.pk
+    content = entry.content
+    future = scheduler.submit(content)
+    future.add_done_callback(lambda f: _writer.submit(_write_back, entry_id, content, f))
+    return future
+
+
+def _write_back(entry_id, content, future):
+    # Runs on a write-back thread, outside any request cycle
+    close_old_connections()
+    try:
+        fields = JournalEntry.sentiment_fields(future.result())
+    except Exception:
+        logger.exception("Error in background sentiment analysis for entry %s", entry_id)
+        fields = JournalEntry.sentiment_fields(None)
+
+    # Only apply the result if the entry still holds the text that was scored;
+    # a later edit will have queued its own job.
+    with transaction.atomic():
+        old = (
+            JournalEntry.objects.select_for_update()
+            .filter(pk=entry_id, sentiment_status='pending', content=content)
+            .values_list('user_id', 'created_at', 'sentiment', 'mood')
+            .first()
+        )
+        if old is None:
+            return
+        # Bump updated_at so delta sync clients pick up the label
+        JournalEntry.objects.filter(pk=entry_id).update(updated_at=timezone.now(), **fields)
+        # update() skips the model signals, so move the rollup count by hand
+        user_id, created_at, _, mood = old
+        rollups.record_change(old, (user_id, created_at, fields['sentiment'], mood))
@@ -1,3 +1,285 @@
-from django.test import TestCase
+import io
+import json
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from . import analytics, importing
+from .models import JournalEntry
+from .views import JournalEntryViewSet
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='writer@example.com', username='writer', password='pw')
+        entries = [
+            ('positive', 'happy', 0), ('positive', 'happy', 1), ('negative', 'sad', 1),
+            ('neutral', 'calm', 3), ('negative', 'sad', 20),
+        ]
+        for sentiment, mood, days_ago in entries:
+            entry = JournalEntry.objects.create(
+                user=self.user, content='entry', sentiment=sentiment, mood=mood
+            )
+            if days_ago:
+                # Backdate through save() so the rollups follow
+                entry.created_at = timezone.now() - timedelta(days=days_ago)
+                entry.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_analytics_uses_one_query(self):
+        with self.assertNumQueries(1):
+            data = analytics.get_analytics(self.user, 'weekly')
+
+        self.assertEqual(data['sentiment_summary'], {'positive': 50.0, 'neutral': 25.0, 'negative': 25.0})
+        self.assertEqual(sum(sum(day.values()) for day in data['sentiment_trends'].values()), 4)
+        counts = {item['mood']: item['count'] for item in data['mood_analysis']['counts']}
+        self.assertEqual(counts, {'happy': 2, 'sad': 1, 'calm': 1})
+        self.assertEqual(len(data['mood_analysis']['timeline']['happy']), 2)
+
+    def test_analytics_endpoint(self):
+        response = self.client.get('/api/journal/entries/analytics/', {'timeframe': 'monthly'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['timeframe'], 'monthly')
+        self.assertEqual(response.data['sentiment_summary']['negative'], 40.0)
+
+        response = self.client.get('/api/journal/entries/analytics/', {'timeframe': 'yearly'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rollups_follow_edits_and_deletes(self):
+        entry = JournalEntry.objects.filter(user=self.user, sentiment='neutral').get()
+        entry.sentiment = 'positive'
+        entry.save()
+        JournalEntry.objects.filter(user=self.user, mood='sad').delete()
+
+        summary = analytics.get_sentiment_summary(self.user, 'monthly')
+        self.assertEqual(summary, {'positive': 100.0, 'neutral': 0, 'negative': 0})
+
+
+@override_settings(ANALYTICS_CACHE_ALIAS='default')
+class AnalyticsCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(email='cached@example.com', username='cached', password='pw')
+        JournalEntry.objects.create(user=self.user, content='entry', sentiment='positive', mood='happy')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_analytics(self, **headers):
+        return self.client.get('/api/journal/entries/analytics/', {'timeframe': 'weekly'}, **headers)
+
+    def test_unchanged_analytics_are_served_from_cache(self):
+        first = self.get_analytics()
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(0):
+            cached = self.get_analytics()
+            not_modified = self.get_analytics(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.data, first.data)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_writes_invalidate_the_cache(self):
+        first = self.get_analytics()
+        # The version is bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            JournalEntry.objects.create(user=self.user, content='entry', sentiment='negative', mood='sad')
+
+        response = self.get_analytics(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.data['sentiment_summary']['negative'], 50.0)
+
+
+class ScoringTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='scored@example.com', username='scored', password='pw')
+        self.entry = JournalEntry.objects.create(
+            user=self.user, content='first draft', mood='calm',
+            **JournalEntry.sentiment_fields({
+                'label': 'positive', 'model_version': 'v1',
+                'probabilities': {'positive': 0.9, 'neutral': 0.07, 'negative': 0.03},
+            })
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(SENTIMENT_ASYNC=False)
+    @mock.patch('journal.views.get_scheduler')
+    def test_failed_rescore_clears_previous_scores(self, get_scheduler):
+        get_scheduler.return_value.predict.return_value = None
+        response = self.client.patch(f'/api/journal/entries/{self.entry.pk}/', {'content': 'second draft'})
+        self.assertEqual(response.status_code, 200)
+
+        self.entry.refresh_from_db()
+        self.assertEqual((self.entry.sentiment, self.entry.sentiment_status), ('neutral', 'failed'))
+        self.assertIsNone(self.entry.sentiment_positive)
+        self.assertIsNone(self.entry.sentiment_confidence)
+        # Picked up again by rescore_sentiment
+        self.assertFalse(JournalEntry.objects.filter(sentiment_model_version='v1').exists())
+
+    @override_settings(SENTIMENT_ASYNC=True)
+    def test_pending_edit_is_left_for_rescore(self):
+        response = self.client.patch(f'/api/journal/entries/{self.entry.pk}/', {'content': 'second draft'})
+        self.assertEqual(response.status_code, 200)
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.sentiment_status, 'pending')
+        self.assertEqual(self.entry.sentiment_model_version, '')
+        self.assertIsNone(self.entry.sentiment_positive)
+
+
+class JournalListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='pager@example.com', username='pager', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_entries(self, count, **fields):
+        JournalEntry.objects.bulk_create(
+            JournalEntry(user=self.user, content=f'entry {i}', mood='calm', **fields) for i in range(count)
+        )
+        return list(JournalEntry.objects.filter(user=self.user).order_by('-created_at', '-id'))
+
+    def test_pages_follow_next_in_stable_order(self):
+        entries = self.create_entries(5)
+        # Rows written in the same instant are ordered by id
+        JournalEntry.objects.filter(user=self.user).update(created_at=timezone.now())
+        expected = sorted(entry.id for entry in entries)[::-1]
+
+        ids, url = [], '/api/journal/entries/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, expected)
+
+    def test_page_is_one_query(self):
+        self.create_entries(3)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/journal/entries/')
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_page_size_is_capped(self):
+        self.create_entries(settings.API_MAX_PAGE_SIZE + 5)
+        response = self.client.get('/api/journal/entries/', {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), settings.API_MAX_PAGE_SIZE)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_previews(self):
+        JournalEntry.objects.create(user=self.user, content='x' * 500, mood='calm')
+        response = self.client.get('/api/journal/entries/previews/')
+        self.assertEqual(response.status_code, 200)
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'id', 'mood', 'sentiment', 'sentiment_status', 'created_at', 'excerpt'})
+        self.assertEqual(row['excerpt'], 'x' * JournalEntryViewSet.EXCERPT_LENGTH)
+        self.assertNotIn('content', row)
+
+
+class ImportParsingTests(TestCase):
+    def parse_array(self, body, chunk_size=3):
+        return list(importing.iter_json_array(io.BytesIO(body), chunk_size=chunk_size))
+
+    def test_array_items_split_across_chunks(self):
+        items = [{'content': 'caf\u00e9, [not] the end', 'mood': 'calm'}, {'content': '\u2603 }{', 'mood': 'sad'}, 3]
+        body = json.dumps(items, ensure_ascii=False).encode()
+        for chunk_size in (1, 2, 3, 7, 64):
+            self.assertEqual(self.parse_array(body, chunk_size), items)
+        self.assertEqual(self.parse_array(b' [ ] \n'), [])
+
+    def test_malformed_arrays(self):
+        for body in (b'{"content": "x"}', b'[1, 2', b'[1 2]', b'[1,]', b'[{"a": }]', b'[1]trailing', b'["\xff"]'):
+            with self.assertRaises(importing.ImportFormatError, msg=body):
+                self.parse_array(body)
+
+    def test_ndjson(self):
+        body = b'{"n": 1}\n\n  {"n": 2}\r\n{"n": 3}'
+        items = list(importing.iter_ndjson(io.BytesIO(body), chunk_size=4))
+        self.assertEqual(items, [{'n': 1}, {'n': 2}, {'n': 3}])
+        with self.assertRaisesMessage(importing.ImportFormatError, 'line 3'):
+            list(importing.iter_ndjson(io.BytesIO(b'{}\n{}\n{oops}\n'), chunk_size=4))
+
+    def test_limits(self):
+        body = b'\n'.join(b'{"content": "entry", "mood": "calm"}' for _ in range(3))
+        with self.assertRaisesMessage(importing.ImportFormatError, 'At most 2'):
+            importing.parse_entries(io.BytesIO(body), 'application/x-ndjson', 2, 1024)
+        with self.assertRaises(importing.ImportTooLargeError):
+            importing.parse_entries(io.BytesIO(body), 'application/x-ndjson', 10, 64)
+
+
+@override_settings(SENTIMENT_ASYNC=False)
+@mock.patch('journal.importing.predict_batch')
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='importer@example.com', username='importer', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, items, content_type='application/json'):
+        body = json.dumps(items) if content_type == 'application/json' else '\n'.join(map(json.dumps, items))
+        return self.client.generic('POST', '/api/journal/entries/bulk/', body, content_type=content_type)
+
+    def result(self, label):
+        probabilities = dict.fromkeys(('positive', 'neutral', 'negative'), 0.0)
+        probabilities[label] = 1.0
+        return {'label': label, 'model_version': 'v1', 'probabilities': probabilities}
+
+    def test_import_scores_in_one_batch_and_keeps_dates(self, predict_batch):
+        predict_batch.return_value = [self.result('positive'), self.result('negative')]
+        written = timezone.now() - timedelta(days=40)
+        response = self.post([
+            {'content': 'old entry', 'mood': 'calm', 'created_at': written.isoformat()},
+            {'content': 'new entry', 'mood': 'sad'},
+        ], content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        predict_batch.assert_called_once_with(['old entry', 'new entry'])
+
+        old, new = JournalEntry.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(old.created_at, written)
+        self.assertEqual((old.sentiment, new.sentiment), ('positive', 'negative'))
+        self.assertGreater(new.created_at, written)
+
+    def test_invalid_entry_rejects_the_whole_import(self, predict_batch):
+        response = self.post([{'content': 'fine', 'mood': 'calm'}, {'content': 'no mood'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertFalse(JournalEntry.objects.exists())
+        predict_batch.assert_not_called()
+
+    @override_settings(JOURNAL_IMPORT_MAX_BYTES=64)
+    def test_oversized_body(self, predict_batch):
+        response = self.post([{'content': 'x' * 100, 'mood': 'calm'}])
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(JournalEntry.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN output checked against PostgreSQL plans")
+class JournalIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='indexed@example.com', username='indexed', password='pw')
+        JournalEntry.objects.bulk_create(
+            JournalEntry(user=self.user, content='entry', mood='calm') for _ in range(50)
+        )
+        with connection.cursor() as cursor:
+            # Tiny test tables would otherwise always be read sequentially
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def test_listing_uses_user_created_index(self):
+        plan = JournalEntry.objects.filter(user=self.user).order_by('-created_at').explain()
+        self.assertRegex(plan, r'Index (Only )?Scan( Backward)? using journal_user_\w+_idx')
+
+    def test_time_range_uses_index(self):
+        since = timezone.now() - timedelta(days=7)
+        plan = JournalEntry.objects.filter(
+            user=self.user, created_at__gte=since
+        ).values('sentiment', 'mood').explain()
+        # An index-only scan once the visibility map is set, an index range scan before
+        self.assertRegex(plan, r'(Index Only|Index|Bitmap Index) Scan (using|on) journal_user_\w+_idx')
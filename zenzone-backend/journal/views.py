@@ -9,32 +9,112 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from authentication.serializers import UserSerializer  
 from rest_framework.permissions import IsAuthenticated
-from journal_sentiment.model_loader import SentimentAnalyzer
+from journal_sentiment.service import get_scheduler
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Substr
+from django.utils.http import quote_etag, parse_etags
+import hashlib
+import io
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from . import analytics
-
-# Initialize sentiment analyzer
-sentiment_analyzer = SentimentAnalyzer()
+from . import cache as analytics_cache
+from . import importing
+from . import tasks
+from zenzone_backend.pagination import CreatedAtCursorPagination
 
 class JournalEntryViewSet(viewsets.ModelViewSet):
     serializer_class = JournalEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+
+    # Characters of content sent as the excerpt in list previews
+    EXCERPT_LENGTH = 200
 
     def get_queryset(self):
         return JournalEntry.objects.filter(user=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        # Body: a JSON array or NDJSON of {content, mood, created_at?} objects,
+        # parsed from the stream rather than through request.data
+        try:
+            items, errors = importing.parse_entries(
+                request.stream or io.BytesIO(), request.content_type.split(';')[0].strip(),
+                settings.JOURNAL_IMPORT_MAX_ENTRIES, settings.JOURNAL_IMPORT_MAX_BYTES
+            )
+        except importing.ImportTooLargeError as e:
+            return Response({'error': str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except importing.ImportFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if errors:
+            # Nothing is saved unless every entry is valid, so a fixed file can be re-sent
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        if not items:
+            return Response({'error': 'No entries'}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = importing.import_entries(request.user, items, score=not settings.SENTIMENT_ASYNC)
+        if settings.SENTIMENT_ASYNC:
+            def enqueue():
+                scheduler = get_scheduler()
+                for entry in entries:
+                    tasks.enqueue_sentiment_scoring(entry, scheduler)
+            transaction.on_commit(enqueue)
+        return Response({
+            'created': len(entries),
+            'results': [
+                {'index': index, 'id': entry.id, 'sentiment': entry.sentiment, 'sentiment_status': entry.sentiment_status}
+                for index, entry in enumerate(entries)
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def previews(self, request):
+        # History list rows: an excerpt cut in the database instead of the full
+        # body, returned as plain dicts without building model instances.
+        # The detail route serves the full entry.
+        queryset = self.get_queryset().values(
+            'id', 'mood', 'sentiment', 'sentiment_status', 'created_at',
+            excerpt=Substr('content', 1, self.EXCERPT_LENGTH)
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(page)
+
+    def _score(self, serializer, **kwargs):
+        instance = serializer.instance
+        if instance is not None and serializer.validated_data.get('content', instance.content) == instance.content:
+            # Only metadata such as mood changed; keep the existing label
+            return serializer.save(**kwargs)
+
+        content = serializer.validated_data.get('content', '')
+        if settings.SENTIMENT_ASYNC:
+            # Save now, let the background worker fill in the label
+            entry = serializer.save(**JournalEntry.pending_sentiment_fields(), **kwargs)
+            transaction.on_commit(lambda: tasks.enqueue_sentiment_scoring(entry, get_scheduler()))
+            return entry
+        result = get_scheduler().predict(content)
+        return serializer.save(**JournalEntry.sentiment_fields(result), **kwargs)
+
     def perform_create(self, serializer):
         # Analyze sentiment before saving
-        content = serializer.validated_data.get('content', '')
-        sentiment = sentiment_analyzer.predict_sentiment(content)
-        serializer.save(user=self.request.user, sentiment=sentiment)
+        self._score(serializer, user=self.request.user)
 
     def perform_update(self, serializer):
         # Re-analyze sentiment on update
-        content = serializer.validated_data.get('content', '')
-        sentiment = sentiment_analyzer.predict_sentiment(content)
-        serializer.save(sentiment=sentiment)
+        self._score(serializer)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Clients polling for a pending sentiment can send If-None-Match
+        entry = self.get_object()
+        etag = quote_etag(hashlib.md5(
+            f"{entry.pk}:{entry.updated_at.isoformat()}:{entry.sentiment_status}:"
+            f"{entry.sentiment_updated_at.isoformat() if entry.sentiment_updated_at else ''}".encode()
+        ).hexdigest())
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        serializer = self.get_serializer(entry)
+        return Response(serializer.data, headers={'ETag': etag})
 
     @action(detail=False, methods=['get'])
     def analytics(self, request):
@@ -43,14 +123,23 @@ class JournalEntryViewSet(viewsets.ModelViewSet):
         if timeframe not in ['daily', 'weekly', 'monthly']:
             return Response({'error': 'Invalid timeframe'}, status=400)
         
-        data = {
-            'sentiment_summary': analytics.get_sentiment_summary(request.user, timeframe),
-            'sentiment_trends': analytics.get_sentiment_trends(request.user, timeframe),
-            'mood_analysis': analytics.get_mood_analysis(request.user, timeframe),
-            'timeframe': timeframe
-        }
-        
-        return Response(data)
+        cache = analytics_cache.get_cache()
+        if cache is None:
+            # One grouped query; summary, trends and moods are derived from its rows
+            return Response(analytics.get_analytics(request.user, timeframe))
+
+        # Cached per user until they write, edit or delete an entry
+        version = analytics_cache.data_version(request.user.pk, cache)
+        key = analytics_cache.analytics_key(request.user.pk, version, timeframe, analytics.window_start(timeframe))
+        headers = {'ETag': quote_etag(analytics_cache.analytics_etag(key)), 'Cache-Control': 'private, no-cache'}
+        if headers['ETag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = cache.get(key)
+        if data is None:
+            data = analytics.get_analytics(request.user, timeframe)
+            cache.set(key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+        return Response(data, headers=headers)
 
     
         
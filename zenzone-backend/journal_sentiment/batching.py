@@ -0,0 +1,105 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    """
+    Coalesces concurrent sentiment requests into batched forward passes.
+
+    Callers submit texts from their request threads; a single worker thread
+    takes everything queued (up to `max_batch_size` texts), runs one
+    `predict_batch` call and resolves every caller's future. Texts that
+    arrive while a batch runs form the next one. The worker only waits, up to
+    `max_wait_ms`, when other texts were already queued behind the first, so
+    a lone request is never delayed. Callers wait at most `timeout` seconds
+    for each result, so a stuck worker fails scores instead of piling up
+    request threads.
+    """
+
+    def __init__(self, analyzer, max_batch_size=32, max_wait_ms=10, timeout=None):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='sentiment-batcher', daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, text):
+        """Queue a text for scoring and return a Future of its result dict."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def predict_batch(self, texts):
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout=self.timeout) for future in futures]
+
+    def predict(self, text):
+        """Score one text and return its result dict, or None if inference failed."""
+        try:
+            return self.submit(text).result(timeout=self.timeout)
+        except Exception:
+            logger.exception("Error in sentiment analysis")
+            return None
+
+    def predict_sentiment(self, text):
+        # Same contract as SentimentAnalyzer.predict_sentiment
+        result = self.predict(text)
+        return result['label'] if result else 'neutral'
+
+    def _collect(self):
+        # Block for the first item and take whatever else is already queued
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if len(batch) == 1:
+            # No concurrent load; waiting would only add latency
+            return batch
+        # Under load, keep the window open briefly for more
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Skip callers that gave up (e.g. cancelled futures)
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                texts = [text for text, _ in batch]
+                results = self.analyzer.predict_batch(texts, batch_size=len(texts))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
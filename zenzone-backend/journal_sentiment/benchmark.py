@@ -0,0 +1,121 @@
+"""
+Inference benchmark helpers used by `manage.py benchmark_sentiment`.
+
+Each backend is measured in its own spawned process so peak RSS reflects
+that backend alone; nothing here imports Django models at module level.
+"""
+import os
+import random
+import resource
+import statistics
+import time
+
+ENGLISH_WORDS = (
+    "today I felt happy calm tired anxious grateful because work family friends "
+    "school walk rain sleep morning evening church market tea lunch talked laughed "
+    "cried worried hopeful proud lonely better worse again really very little much"
+).split()
+
+SWAHILI_WORDS = (
+    "leo nimejisikia furaha amani uchovu wasiwasi shukrani kwa sababu kazi familia "
+    "marafiki shule kutembea mvua usingizi asubuhi jioni kanisa soko chai chakula "
+    "tuliongea tulicheka nililia nilihofia matumaini fahari upweke vizuri vibaya tena sana"
+).split()
+
+LANGUAGES = {'en': ENGLISH_WORDS, 'sw': SWAHILI_WORDS}
+
+
+def make_texts(language, words, count, seed=0):
+    """`count` synthetic journal entries of roughly `words` words each."""
+    rng = random.Random(f"{seed}:{language}:{words}")
+    vocabulary = LANGUAGES[language]
+    texts = []
+    for _ in range(count):
+        sentence = []
+        while len(sentence) < words:
+            chunk = rng.sample(vocabulary, k=min(len(vocabulary), rng.randint(4, 12)))
+            sentence.extend(chunk)
+            sentence[-1] += '.'
+        texts.append(' '.join(sentence[:words]))
+    return texts
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (2**20 if os.uname().sysname == 'Darwin' else 2**10)
+
+
+def build_analyzer(backend, threads):
+    import torch
+    from .model_loader import SentimentAnalyzer
+    from .service import get_bundle
+
+    torch.set_num_threads(threads)
+    analyzer = SentimentAnalyzer(
+        backend=backend, bundle=get_bundle(), chunking=False,
+        intra_op_threads=threads, inter_op_threads=1
+    )
+    if analyzer.model is not None:
+        # Benchmarks target the CPU-only serving hosts
+        analyzer.device = torch.device('cpu')
+        analyzer.model.to(analyzer.device)
+    return analyzer
+
+
+def run_backend(backend, thread_counts, batch_sizes, paddings, lengths, iterations, warmup, seed):
+    """Measure one backend across every configuration; runs in a child process."""
+    # Never reach for the network: the model must come from the bundle or local cache
+    os.environ['HF_HUB_OFFLINE'] = '1'
+    os.environ['TRANSFORMERS_OFFLINE'] = '1'
+    import django
+    django.setup()
+
+    load_started = time.perf_counter()
+    results = []
+    for threads in thread_counts:
+        analyzer = build_analyzer(backend, threads)
+        load_seconds = time.perf_counter() - load_started
+        for padding in paddings:
+            analyzer.padding = padding
+            for language in LANGUAGES:
+                for words in lengths:
+                    for batch_size in batch_sizes:
+                        texts = make_texts(language, words, batch_size, seed)
+                        for _ in range(warmup):
+                            analyzer.predict_batch(texts, batch_size=batch_size)
+                        latencies = []
+                        for _ in range(iterations):
+                            started = time.perf_counter()
+                            analyzer.predict_batch(texts, batch_size=batch_size)
+                            latencies.append((time.perf_counter() - started) * 1000)
+                        results.append({
+                            'backend': backend,
+                            'model_version': analyzer.model_version,
+                            'threads': threads,
+                            'padding': padding,
+                            'language': language,
+                            'words': words,
+                            'batch_size': batch_size,
+                            'iterations': iterations,
+                            'latency_ms': {
+                                'mean': statistics.fmean(latencies),
+                                'p50': percentile(latencies, 50),
+                                'p90': percentile(latencies, 90),
+                                'p99': percentile(latencies, 99),
+                            },
+                            'throughput_per_s': batch_size * 1000 / statistics.fmean(latencies),
+                            'load_seconds': load_seconds,
+                        })
+        load_started = time.perf_counter()
+        del analyzer
+
+    for result in results:
+        result['peak_rss_mb'] = peak_rss_mb()
+    return results
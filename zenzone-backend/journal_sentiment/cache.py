@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    # Entries that differ only in whitespace or unicode form score the same
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def cache_key(text, model_version):
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"sentiment:{model_version}:{digest}"
+
+
+class CachedSentimentAnalyzer:
+    """
+    Content-hash cache in front of a SentimentAnalyzer.
+
+    Results are kept in a bounded in-process LRU and, optionally, in a Django
+    cache backend shared between workers. Keys include the model version so
+    shipping a new model never serves stale labels.
+    """
+
+    def __init__(self, analyzer, max_size=10000, backend=None, timeout=None):
+        self.analyzer = analyzer
+        self.model_version = analyzer.model_version
+        self.max_size = max_size
+        self.backend = backend
+        self.timeout = timeout
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_local(self, key):
+        with self._lock:
+            result = self._lru.get(key)
+            if result is not None:
+                self._lru.move_to_end(key)
+            return result
+
+    def _set_local(self, key, result):
+        with self._lock:
+            self._lru[key] = result
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def predict_batch(self, texts, batch_size=None):
+        texts = list(texts)
+        keys = [cache_key(text, self.model_version) for text in texts]
+        found = {}
+
+        for key in set(keys):
+            result = self._get_local(key)
+            if result is not None:
+                found[key] = result
+
+        if self.backend is not None:
+            missing = [key for key in set(keys) if key not in found]
+            if missing:
+                for key, result in self.backend.get_many(missing).items():
+                    found[key] = result
+                    self._set_local(key, result)
+
+        # Score each distinct uncached text once
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        with self._lock:
+            self.hits += len(texts) - len(pending)
+            self.misses += len(pending)
+
+        if pending:
+            results = self.analyzer.predict_batch(list(pending.values()), batch_size=batch_size)
+            scored = dict(zip(pending.keys(), results))
+            for key, result in scored.items():
+                self._set_local(key, result)
+            if self.backend is not None:
+                self.backend.set_many(scored, timeout=self.timeout)
+            found.update(scored)
+
+        return [found[key] for key in keys]
+
+    def predict_sentiment(self, text):
+        return self.predict_batch([text])[0]['label']
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
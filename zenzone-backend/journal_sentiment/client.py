@@ -0,0 +1,105 @@
+import itertools
+import json
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteSentimentClient:
+    """
+    Talks to a `manage.py run_sentiment_server` process over its Unix socket.
+
+    Offers the same interface as BatchScheduler (submit / predict /
+    predict_sentiment / predict_batch), so web workers can score entries
+    without loading the model themselves.
+
+    Protocol: one JSON object per line in each direction.
+        -> {"id": 1, "texts": ["..."]}
+        <- {"id": 1, "results": [{"label": ..., "probabilities": {...}, "model_version": ...}]}
+        <- {"id": 1, "error": "..."}
+    """
+
+    def __init__(self, socket_path, timeout=30, max_concurrency=4):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        # Runs submit() calls so callers get a Future like BatchScheduler's
+        self._executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix='sentiment-client')
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._local.sock = sock
+        self._local.stream = sock.makefile('rwb')
+        return self._local.stream
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                self._local.stream.close()
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+        self._local.stream = None
+
+    def _call(self, payload, timeout=None):
+        data = json.dumps(payload).encode('utf-8') + b'\n'
+        # One persistent connection per thread. A reused connection may have
+        # gone stale (e.g. the server restarted), which shows up as a failed
+        # write or an empty read; only then is the request sent again.
+        for attempt in range(2):
+            reused = getattr(self._local, 'stream', None) is not None
+            stream = self._local.stream if reused else self._connect()
+            self._local.sock.settimeout(timeout or self.timeout)
+            try:
+                stream.write(data)
+                stream.flush()
+            except OSError:
+                self._close()
+                if reused:
+                    continue
+                raise
+            try:
+                line = stream.readline()
+            except OSError:
+                # Timed out or reset after the request went out: the server
+                # may still be working on it, so it is not sent twice
+                self._close()
+                raise
+            if not line:
+                self._close()
+                if reused:
+                    continue
+                raise ConnectionError("Sentiment server closed the connection")
+            return json.loads(line)
+
+    def predict_batch(self, texts, batch_size=None, timeout=None):
+        texts = list(texts)
+        if not texts:
+            return []
+        response = self._call({'id': next(self._ids), 'texts': texts}, timeout=timeout)
+        if 'error' in response:
+            raise RuntimeError(f"Sentiment server error: {response['error']}")
+        return response['results']
+
+    def submit(self, text):
+        return self._executor.submit(lambda: self.predict_batch([text])[0])
+
+    def predict(self, text):
+        """Score one text and return its result dict, or None if inference failed."""
+        try:
+            return self.predict_batch([text])[0]
+        except Exception:
+            logger.exception("Error in sentiment analysis")
+            return None
+
+    def predict_sentiment(self, text):
+        result = self.predict(text)
+        return result['label'] if result else 'neutral'
@@ -0,0 +1,89 @@
+import json
+import multiprocessing
+import os
+import platform
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from journal_sentiment import benchmark
+from journal_sentiment.model_loader import SentimentAnalyzer
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def str_list(value):
+    return [v for v in value.split(',') if v]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark SentimentAnalyzer offline on CPU across backends, batch sizes, padding "
+        "strategies and thread counts using synthetic English and Kiswahili entries, and "
+        "write the results as JSON for regression comparison."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', type=str_list, default=['torch', 'quantized', 'onnx'])
+        parser.add_argument('--batch-sizes', type=int_list, default=[1, 8, 32])
+        parser.add_argument('--paddings', type=str_list, default=['longest', 'max_length'])
+        parser.add_argument('--threads', type=int_list, default=[1, os.cpu_count() or 1])
+        parser.add_argument(
+            '--lengths', type=int_list, default=[20, 100, 350],
+            help="Approximate entry lengths in words"
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='sentiment_benchmark.json')
+
+    def handle(self, *args, **options):
+        unknown = set(options['backends']) - set(SentimentAnalyzer.BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(sorted(unknown))}")
+
+        results = []
+        for backend in options['backends']:
+            self.stdout.write(f"Benchmarking {backend}...")
+            # A fresh process per backend keeps peak RSS figures separate
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                future = pool.submit(
+                    benchmark.run_backend, backend, options['threads'], options['batch_sizes'],
+                    options['paddings'], options['lengths'], options['iterations'],
+                    options['warmup'], options['seed']
+                )
+                try:
+                    backend_results = future.result()
+                except Exception as e:
+                    self.stderr.write(f"Skipping {backend}: {e}")
+                    continue
+            results.extend(backend_results)
+            for r in backend_results:
+                self.stdout.write(
+                    f"  {r['threads']:>2} threads  {r['padding']:<10} {r['language']}  "
+                    f"{r['words']:>4} words  batch {r['batch_size']:>3}  "
+                    f"p50 {r['latency_ms']['p50']:8.1f} ms  p99 {r['latency_ms']['p99']:8.1f} ms  "
+                    f"{r['throughput_per_s']:8.1f} entries/s  rss {r['peak_rss_mb']:.0f} MB"
+                )
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'platform': platform.platform(),
+                'python': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+                'options': {
+                    key: options[key] for key in (
+                        'backends', 'batch_sizes', 'paddings', 'threads', 'lengths',
+                        'iterations', 'warmup', 'seed'
+                    )
+                },
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from safetensors.torch import save_file
+
+from journal_sentiment.model_loader import (
+    BASE_MODEL, BUNDLE_MANIFEST, BUNDLE_WEIGHTS, MODEL_PATH, SentimentAnalyzer,
+    load_fp32_model, load_tokenizer
+)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Build a self-contained sentiment model bundle (config, tokenizer files and "
+        "fine-tuned weights as safetensors) that loads with no network access."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.SENTIMENT_MODEL_BUNDLE)
+        parser.add_argument(
+            '--bundle-version', default=SentimentAnalyzer.MODEL_VERSION,
+            help="Model version recorded in the manifest and used in cache keys"
+        )
+        parser.add_argument('--force', action='store_true', help="Replace an existing bundle")
+
+    def handle(self, *args, **options):
+        output = options['output']
+        if os.path.exists(output) and not options['force']:
+            raise CommandError(f"{output} already exists; use --force to replace it")
+
+        # Build into a temporary directory so a half-written bundle is never
+        # picked up, and an existing one stays in place if the build fails
+        staging = f"{output}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            manifest = self.build(staging, options['bundle_version'])
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if os.path.exists(output):
+            previous = f"{output}.old"
+            shutil.rmtree(previous, ignore_errors=True)
+            os.rename(output, previous)
+            os.rename(staging, output)
+            shutil.rmtree(previous)
+        else:
+            os.rename(staging, output)
+        self.stdout.write(f"Built sentiment bundle {manifest['version']} at {output}")
+
+    def build(self, staging, version):
+        tokenizer = load_tokenizer()
+        model = load_fp32_model()
+        model.config.id2label = dict(enumerate(SentimentAnalyzer.LABELS))
+        model.config.label2id = {label: i for i, label in enumerate(SentimentAnalyzer.LABELS)}
+
+        tokenizer.save_pretrained(staging)
+        model.config.save_pretrained(staging)
+        state_dict = {k: v.contiguous() for k, v in model.state_dict().items()}
+        save_file(state_dict, os.path.join(staging, BUNDLE_WEIGHTS), metadata={'format': 'pt'})
+
+        manifest = {
+            'version': version,
+            'base_model': BASE_MODEL,
+            'source_weights': os.path.basename(MODEL_PATH),
+            'created_at': timezone.now().isoformat(),
+            'files': {
+                name: file_sha256(os.path.join(staging, name))
+                for name in sorted(os.listdir(staging))
+            },
+        }
+        with open(os.path.join(staging, BUNDLE_MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
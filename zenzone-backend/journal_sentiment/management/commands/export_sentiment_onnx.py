@@ -0,0 +1,67 @@
+import os
+
+import torch
+from django.core.management.base import BaseCommand, CommandError
+
+from journal_sentiment.service import get_bundle
+from journal_sentiment.model_loader import (
+    ONNX_MODEL_PATH, SentimentAnalyzer, load_fp32_model, load_onnx_session
+)
+
+SAMPLE_TEXTS = [
+    "Today was a good day, I spent time with my family.",
+    "Nimechoka sana leo na sijui la kufanya.",
+    "I feel okay.",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the fine-tuned sentiment classifier to ONNX for SENTIMENT_BACKEND='onnx' "
+        "and check that onnxruntime reproduces the torch labels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=ONNX_MODEL_PATH)
+        parser.add_argument('--opset', type=int, default=17)
+
+    def handle(self, *args, **options):
+        bundle = get_bundle()
+        model = load_fp32_model(bundle=bundle)
+        torch_analyzer = SentimentAnalyzer(backend='torch', model=model, bundle=bundle)
+        torch_analyzer.device = torch.device('cpu')
+        model.to(torch_analyzer.device)
+
+        dummy = torch_analyzer.tokenizer(SAMPLE_TEXTS[:2], padding=True, return_tensors="pt")
+        torch.onnx.export(
+            model,
+            (dummy['input_ids'], dummy['attention_mask']),
+            options['output'],
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'},
+            },
+            opset_version=options['opset'],
+        )
+        self.stdout.write(
+            f"Saved {options['output']} ({os.path.getsize(options['output']) / 2**20:.1f} MB)"
+        )
+
+        # The onnx analyzer must agree with torch on the label mapping
+        onnx_analyzer = SentimentAnalyzer(
+            backend='onnx', session=load_onnx_session(options['output']), bundle=bundle
+        )
+
+        expected = torch_analyzer.predict_batch(SAMPLE_TEXTS)
+        actual = onnx_analyzer.predict_batch(SAMPLE_TEXTS)
+        max_diff = max(
+            abs(a['probabilities'][label] - b['probabilities'][label])
+            for a, b in zip(expected, actual)
+            for label in SentimentAnalyzer.LABELS
+        )
+        self.stdout.write(f"Max probability difference vs torch: {max_diff:.5f}")
+        if [r['label'] for r in expected] != [r['label'] for r in actual]:
+            raise CommandError("ONNX model labels differ from the torch model")
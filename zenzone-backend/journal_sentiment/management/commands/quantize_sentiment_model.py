@@ -0,0 +1,80 @@
+import csv
+import os
+import time
+
+import torch
+from django.core.management.base import BaseCommand, CommandError
+
+from journal_sentiment.service import get_bundle
+from journal_sentiment.model_loader import (
+    MODEL_PATH, QUANTIZED_MODEL_PATH, SentimentAnalyzer, load_fp32_model, quantize_model
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the dynamic int8 sentiment model used by SENTIMENT_BACKEND='quantized' "
+        "and optionally check it against the fp32 model on a labelled CSV (text,label)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=QUANTIZED_MODEL_PATH)
+        parser.add_argument('--eval-file', help="CSV with 'text' and 'label' columns")
+        parser.add_argument(
+            '--min-agreement', type=float, default=0.98,
+            help="Fail if int8 and fp32 labels agree on less than this fraction of --eval-file"
+        )
+
+    def handle(self, *args, **options):
+        self.bundle = get_bundle()
+        model = load_fp32_model(bundle=self.bundle)
+        quantized = quantize_model(model)
+        torch.save(quantized.state_dict(), options['output'])
+        self.stdout.write(
+            f"Saved {options['output']} "
+            f"({os.path.getsize(options['output']) / 2**20:.1f} MB, "
+            f"fp32 checkpoint {os.path.getsize(MODEL_PATH) / 2**20:.1f} MB)"
+        )
+
+        if options['eval_file']:
+            self.check_parity(model, quantized, options['eval_file'], options['min_agreement'])
+
+    def check_parity(self, model, quantized, eval_file, min_agreement):
+        with open(eval_file, newline='', encoding='utf-8') as f:
+            rows = [row for row in csv.DictReader(f) if row.get('text')]
+        if not rows:
+            raise CommandError(f"No rows with a 'text' column in {eval_file}")
+        texts = [row['text'] for row in rows]
+        labels = [row.get('label', '').strip().lower() for row in rows]
+
+        fp32 = SentimentAnalyzer(backend='torch', model=model, bundle=self.bundle)
+        int8 = SentimentAnalyzer(backend='quantized', model=quantized, bundle=self.bundle)
+        # Compare on the same device so only the quantization differs
+        fp32.device = torch.device('cpu')
+        fp32.model.to(fp32.device)
+
+        reports = {}
+        for name, analyzer in (('fp32', fp32), ('int8', int8)):
+            start = time.perf_counter()
+            results = analyzer.predict_batch(texts)
+            elapsed = time.perf_counter() - start
+            reports[name] = results
+            correct = sum(r['label'] == label for r, label in zip(results, labels))
+            self.stdout.write(
+                f"{name}: accuracy {correct / len(rows):.3f}, "
+                f"{elapsed * 1000 / len(rows):.1f} ms/entry"
+            )
+
+        agreement = sum(
+            a['label'] == b['label'] for a, b in zip(reports['fp32'], reports['int8'])
+        ) / len(rows)
+        max_diff = max(
+            abs(a['probabilities'][label] - b['probabilities'][label])
+            for a, b in zip(reports['fp32'], reports['int8'])
+            for label in SentimentAnalyzer.LABELS
+        )
+        self.stdout.write(f"Label agreement {agreement:.3f}, max probability difference {max_diff:.4f}")
+        if agreement < min_agreement:
+            raise CommandError(
+                f"int8 model agrees with fp32 on {agreement:.3f} of entries (< {min_agreement})"
+            )
@@ -0,0 +1,71 @@
+import json
+import os
+import socketserver
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from journal_sentiment import service
+
+
+class SentimentRequestHandler(socketserver.StreamRequestHandler):
+    # See journal_sentiment.client.RemoteSentimentClient for the protocol
+
+    def handle(self):
+        scheduler = self.server.scheduler
+        for line in self.rfile:
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                texts = request['texts']
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("'texts' must be a list of strings")
+                # Texts from all connections share the scheduler's batches
+                response = {'id': request_id, 'results': scheduler.predict_batch(texts)}
+            except Exception as e:
+                response = {'id': request_id, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class SentimentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, scheduler):
+        self.scheduler = scheduler
+        super().__init__(socket_path, SentimentRequestHandler)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a standalone sentiment inference process that owns the model and serves "
+        "web workers over a Unix socket (set SENTIMENT_SERVER_SOCKET in the web workers)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=settings.SENTIMENT_SERVER_SOCKET)
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+        if not socket_path:
+            raise CommandError("Pass --socket or set SENTIMENT_SERVER_SOCKET")
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        # This process is the only one on the host running inference
+        service.configure_threads(processes=1)
+        scheduler = service.get_local_scheduler()
+        self.stdout.write(f"Loaded sentiment model {scheduler.analyzer.model_version}")
+
+        server = SentimentServer(socket_path, scheduler)
+        os.chmod(socket_path, 0o660)
+        self.stdout.write(f"Serving sentiment inference on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
@@ -1,61 +1,236 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+from safetensors.torch import load_file as load_safetensors
+import json
+import logging
 import os
-import traceback
+import numpy as np
+
+from .tokenization import TokenizationStage
+
+logger = logging.getLogger(__name__)
+
+BASE_MODEL = "Davlan/afro-xlmr-small"
+MODELS_DIR = os.path.join(os.path.dirname(__file__), 'models')
+MODEL_PATH = os.path.join(MODELS_DIR, 'sentiment_model.pth')
+QUANTIZED_MODEL_PATH = os.path.join(MODELS_DIR, 'sentiment_model_int8.pth')
+ONNX_MODEL_PATH = os.path.join(MODELS_DIR, 'sentiment_model.onnx')
+# Self-contained, offline model directory built by `manage.py build_sentiment_bundle`
+BUNDLE_MANIFEST = 'manifest.json'
+BUNDLE_WEIGHTS = 'model.safetensors'
+
+
+def read_bundle_manifest(bundle):
+    with open(os.path.join(bundle, BUNDLE_MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_tokenizer(bundle=None):
+    if bundle:
+        return AutoTokenizer.from_pretrained(bundle, local_files_only=True, use_fast=True)
+    return AutoTokenizer.from_pretrained(BASE_MODEL, use_fast=True)
+
+
+def load_config(bundle=None):
+    if bundle:
+        return AutoConfig.from_pretrained(bundle, local_files_only=True)
+    return AutoConfig.from_pretrained(BASE_MODEL, num_labels=3)
+
+
+def load_fp32_model(device=None, bundle=None):
+    """
+    Build the classifier from its config and attach the fine-tuned weights.
+    The checkpoint holds the full state dict, so the base model's pretrained
+    weights are never downloaded. On CPU the checkpoint is memory-mapped and
+    assigned in place, so processes forked after loading share its pages.
+
+    With a bundle (see `manage.py build_sentiment_bundle`) everything is read
+    from that directory and the weights come from its safetensors file.
+    """
+    model = AutoModelForSequenceClassification.from_config(load_config(bundle))
+    if bundle:
+        state_dict = load_safetensors(os.path.join(bundle, BUNDLE_WEIGHTS), device='cpu')
+        model.load_state_dict(state_dict, assign=True)
+        model.to(device or 'cpu')
+    elif device is None or torch.device(device).type == 'cpu':
+        state_dict = torch.load(MODEL_PATH, map_location='cpu', mmap=True)
+        model.load_state_dict(state_dict, assign=True)
+    else:
+        model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
+    model.eval()
+    return model
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to the model's Linear layers."""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_quantized_model(path=QUANTIZED_MODEL_PATH, bundle=None):
+    """
+    Load the persisted int8 artifact if present (built by
+    `manage.py quantize_sentiment_model`), otherwise quantize the fp32 weights.
+    """
+    if not os.path.exists(path):
+        return quantize_model(load_fp32_model(bundle=bundle))
+    # Build an empty model with the right shape, quantize it, then fill in the
+    # int8 weights; the fp32 checkpoint is never read.
+    model = quantize_model(AutoModelForSequenceClassification.from_config(load_config(bundle)))
+    model.load_state_dict(torch.load(path, map_location='cpu'))
+    model.eval()
+    return model
+
+
+def load_onnx_session(path=ONNX_MODEL_PATH, intra_op_threads=0, inter_op_threads=0):
+    """
+    Open the model exported by `manage.py export_sentiment_onnx`.
+    Thread counts of 0 leave the choice to onnxruntime.
+    """
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+
 
 class SentimentAnalyzer:
-    def __init__(self):
+    # Index of each label in the classifier's output logits
+    LABELS = ('positive', 'neutral', 'negative')
+    MAX_LENGTH = 512
+    # Tokens shared by consecutive windows of a chunked long entry
+    CHUNK_STRIDE = 128
+    BATCH_SIZE = 16
+    # Bump whenever models/sentiment_model.pth is retrained
+    MODEL_VERSION = 'afro-xlmr-small-ft-1'
+    BACKENDS = ('torch', 'quantized', 'onnx')
+
+    def __init__(self, model_version=None, backend='torch', model=None, session=None, tokenizer=None,
+                 intra_op_threads=0, inter_op_threads=0, bundle=None, chunking=True):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown sentiment backend: {backend}")
+        self.model_version = self.resolve_model_version(model_version, backend, bundle)
+        self.backend = backend
+        self.chunking = chunking
+        # 'max_length' restores the old pad-everything-to-512 behaviour (benchmarks only)
+        self.padding = 'longest'
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        model_path = os.path.join(os.path.dirname(__file__), 'models/sentiment_model.pth')
-        
-        self.tokenizer = AutoTokenizer.from_pretrained("Davlan/afro-xlmr-small")
-        self.model = AutoModelForSequenceClassification.from_pretrained(
-            "Davlan/afro-xlmr-small",
-            num_labels=3
+
+        self.tokenizer = tokenizer or load_tokenizer(bundle)
+        self.tokenization = TokenizationStage(
+            self.tokenizer,
+            max_length=self.MAX_LENGTH,
+            stride=self.CHUNK_STRIDE if chunking else 0
         )
-        
-        self.model.load_state_dict(torch.load(model_path, map_location=self.device))
+        if backend == 'onnx':
+            self.device = None
+            self.model = None
+            self.session = session or load_onnx_session(
+                intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads
+            )
+            self.session_inputs = [i.name for i in self.session.get_inputs()]
+            return
+        if backend == 'quantized':
+            # Dynamic int8 kernels only exist for CPU
+            self.device = torch.device('cpu')
+            self.model = model or load_quantized_model(bundle=bundle)
+        else:
+            self.model = model or load_fp32_model(self.device, bundle=bundle)
         self.model.to(self.device)
         self.model.eval()
 
+    @classmethod
+    def resolve_model_version(cls, model_version=None, backend='torch', bundle=None):
+        """The version string an analyzer built with these arguments reports."""
+        if bundle and not model_version:
+            model_version = read_bundle_manifest(bundle)['version']
+        model_version = model_version or cls.MODEL_VERSION
+        if backend != 'torch':
+            # Outputs differ slightly between backends, so keep them apart in caches
+            model_version = f"{model_version}+{backend}"
+        return model_version
+
+    def predict_batch(self, texts, batch_size=None):
+        """
+        Score a list of texts and return one result per text, in input order:
+        {'label': 'positive', 'probabilities': {'positive': .., 'neutral': .., 'negative': ..},
+         'model_version': ..}
+
+        Texts are sorted by token length and padded only to the longest
+        sequence of their bucket, so short entries don't pay for 512 tokens.
+        With chunking enabled, texts longer than MAX_LENGTH tokens are split
+        into overlapping windows that are scored alongside everything else and
+        averaged, weighted by window length.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        batch_size = batch_size or self.BATCH_SIZE
+
+        # Unpadded windows, the text each belongs to, and their token lengths
+        encoded, owners, lengths = self.tokenization.encode(texts)
+        order = sorted(range(len(owners)), key=lengths.__getitem__)
+
+        totals = [[0.0] * len(self.LABELS) for _ in texts]
+        weights = [0] * len(texts)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            probabilities = self._forward([encoded[w] for w in bucket])
+
+            for w, probs in zip(bucket, probabilities):
+                i = owners[w]
+                weights[i] += lengths[w]
+                totals[i] = [t + p * lengths[w] for t, p in zip(totals[i], probs)]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scored %d texts as %d windows in %d batches (longest %d tokens)",
+                len(texts), len(owners), -(-len(order) // batch_size), max(lengths)
+            )
+
+        results = []
+        for total, weight in zip(totals, weights):
+            probs = [t / weight for t in total]
+            predicted_class = max(range(len(probs)), key=probs.__getitem__)
+            results.append({
+                'label': self.LABELS[predicted_class],
+                'probabilities': dict(zip(self.LABELS, probs)),
+                'model_version': self.model_version,
+            })
+        return results
+
+    def _forward(self, features):
+        # Pad one bucket (to its longest sequence by default) and return softmax rows
+        if self.backend == 'onnx':
+            inputs = self.tokenizer.pad(
+                features, padding=self.padding, max_length=self.MAX_LENGTH, return_tensors="np"
+            )
+            feed = {name: inputs[name].astype(np.int64) for name in self.session_inputs}
+            logits = self.session.run(['logits'], feed)[0]
+            exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            return (exp / exp.sum(axis=-1, keepdims=True)).tolist()
+
+        inputs = self.tokenizer.pad(
+            features, padding=self.padding, max_length=self.MAX_LENGTH, return_tensors="pt"
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            return torch.nn.functional.softmax(outputs.logits, dim=-1).cpu().tolist()
+
     def predict_sentiment(self, text):  # Make sure this method name matches exactly
         try:
-            print("Input text:", text)
-            
-            inputs = self.tokenizer(
-                text,
-                padding='max_length',
-                truncation=True,
-                max_length=512,
-                return_tensors="pt"
-            )
-            
-            print("Tokenized length:", len(inputs['input_ids'][0]))
-            print("First few tokens:", self.tokenizer.decode(inputs['input_ids'][0][:10]))
-            
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                predicted_class = torch.argmax(predictions, dim=-1).item()
-                
-                probs = predictions[0].cpu().numpy()
-                print("Prediction probabilities:")
-                print(f"Positive: {probs[0]:.3f}")
-                print(f"Neutral: {probs[1]:.3f}")
-                print(f"Negative: {probs[2]:.3f}")
-
-            sentiment_map = {
-                0: 'positive',
-                1: 'neutral',
-                2: 'negative'
-            }
-            result = sentiment_map[predicted_class]
-            print("Final sentiment:", result)
-            return result
-            
-        except Exception as e:
-            print(f"Error in sentiment analysis: {e}")
-            print(f"Stack trace:", traceback.format_exc())
-            return 'neutral'
\ No newline at end of file
+            result = self.predict_batch([text])[0]
+            if logger.isEnabledFor(logging.DEBUG):
+                probs = result['probabilities']
+                # Never log the entry itself, only its size
+                logger.debug(
+                    "Sentiment %s for %d chars (positive %.3f, neutral %.3f, negative %.3f)",
+                    result['label'], len(text), probs['positive'], probs['neutral'], probs['negative']
+                )
+            return result['label']
+
+        except Exception:
+            logger.exception("Error in sentiment analysis")
+            return 'neutral'
@@ -0,0 +1,21 @@
+"""
+Entry points for inference worker processes (e.g. a ProcessPoolExecutor with
+the 'spawn' start method). Kept free of model imports at module level so
+children can unpickle them before Django is set up.
+"""
+
+_analyzer = None
+
+
+def init_worker(threads):
+    # Each pool process loads its own model and gets a share of the cores
+    global _analyzer
+    import django
+    django.setup()
+    from .service import configure_threads, get_analyzer
+    configure_threads(intra_op=threads, inter_op=1)
+    _analyzer = get_analyzer()
+
+
+def score_texts(texts):
+    return _analyzer.predict_batch(texts)
@@ -0,0 +1,211 @@
+import logging
+import os
+import threading
+
+import torch
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .batching import BatchScheduler
+from .cache import CachedSentimentAnalyzer
+from .client import RemoteSentimentClient
+from .model_loader import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_threads_lock = threading.Lock()
+_analyzer = None
+_scheduler = None
+_client = None
+_threads = None
+
+
+def get_bundle():
+    """The configured offline model bundle, or None if it hasn't been built."""
+    bundle = settings.SENTIMENT_MODEL_BUNDLE
+    return bundle if bundle and os.path.isdir(bundle) else None
+
+
+def get_model_version():
+    """Version of the configured model, without loading it."""
+    return SentimentAnalyzer.resolve_model_version(
+        settings.SENTIMENT_MODEL_VERSION, settings.SENTIMENT_BACKEND, get_bundle()
+    )
+
+
+def available_cpus():
+    # Respects CPU affinity / container cpusets where the platform exposes them
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_threads(value, processes):
+    """An int thread count, or 'auto' for this process's share of the cores."""
+    if str(value).strip().lower() == 'auto':
+        return max(1, available_cpus() // max(1, processes))
+    return int(value)
+
+
+def configure_threads(intra_op=None, inter_op=None, processes=None):
+    """
+    Apply the torch thread settings to this process, once; later calls are
+    no-ops. Arguments override SENTIMENT_TORCH_THREADS,
+    SENTIMENT_TORCH_INTEROP_THREADS and SENTIMENT_PROCESSES_PER_HOST.
+    Returns the configured values.
+    """
+    global _threads
+    with _threads_lock:
+        if _threads is not None:
+            return _threads
+        processes = processes or settings.SENTIMENT_PROCESSES_PER_HOST
+        intra = resolve_threads(settings.SENTIMENT_TORCH_THREADS if intra_op is None else intra_op, processes)
+        inter = resolve_threads(
+            settings.SENTIMENT_TORCH_INTEROP_THREADS if inter_op is None else inter_op, processes
+        )
+        if intra:
+            torch.set_num_threads(intra)
+        if inter:
+            try:
+                torch.set_num_interop_threads(inter)
+            except RuntimeError:
+                # Only allowed once, before any inter-op parallel work
+                logger.warning(
+                    "Torch inter-op threads already fixed at %s", torch.get_num_interop_threads()
+                )
+        _threads = {'processes': processes, 'intra_op': intra, 'inter_op': inter}
+        logger.info(
+            "Sentiment inference using %s intra-op / %s inter-op threads (%s CPUs, %s processes)",
+            torch.get_num_threads(), torch.get_num_interop_threads(), available_cpus(), processes
+        )
+    return _threads
+
+
+def get_analyzer():
+    """
+    The process-wide SentimentAnalyzer (behind the content cache), built on
+    first use so imports, management commands and tests don't load the model.
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _lock:
+            if _analyzer is None:
+                threads = configure_threads()
+                analyzer = SentimentAnalyzer(
+                    model_version=settings.SENTIMENT_MODEL_VERSION,
+                    backend=settings.SENTIMENT_BACKEND,
+                    intra_op_threads=settings.SENTIMENT_ONNX_INTRA_OP_THREADS or threads['intra_op'],
+                    inter_op_threads=settings.SENTIMENT_ONNX_INTER_OP_THREADS,
+                    bundle=get_bundle(),
+                    chunking=settings.SENTIMENT_CHUNKING
+                )
+                # Unchanged or duplicate texts are answered from the content-hash cache
+                _analyzer = CachedSentimentAnalyzer(
+                    analyzer,
+                    max_size=settings.SENTIMENT_CACHE_SIZE,
+                    backend=caches[settings.SENTIMENT_CACHE_ALIAS] if settings.SENTIMENT_CACHE_ALIAS else None,
+                    timeout=settings.SENTIMENT_CACHE_TIMEOUT
+                )
+    return _analyzer
+
+
+def get_local_scheduler():
+    """The in-process batching scheduler in front of this process's model."""
+    global _scheduler
+    if _scheduler is None:
+        analyzer = get_analyzer()
+        with _lock:
+            if _scheduler is None:
+                _scheduler = BatchScheduler(
+                    analyzer,
+                    max_batch_size=settings.SENTIMENT_BATCH_MAX_SIZE,
+                    max_wait_ms=settings.SENTIMENT_BATCH_WINDOW_MS,
+                    timeout=settings.SENTIMENT_PREDICT_TIMEOUT
+                )
+    return _scheduler
+
+
+def get_scheduler():
+    """
+    What request threads submit texts to: a client for the standalone
+    inference server when SENTIMENT_SERVER_SOCKET is set, otherwise the
+    in-process scheduler.
+    """
+    global _client
+    if not settings.SENTIMENT_SERVER_SOCKET:
+        return get_local_scheduler()
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = RemoteSentimentClient(
+                    settings.SENTIMENT_SERVER_SOCKET, timeout=settings.SENTIMENT_SERVER_TIMEOUT
+                )
+    return _client
+
+
+def predict_batch(texts):
+    """
+    Score many texts in one call, e.g. for imports: straight through the
+    local analyzer (which buckets them by length itself), or as a single
+    request to the inference server.
+    """
+    if settings.SENTIMENT_SERVER_SOCKET:
+        return get_scheduler().predict_batch(texts, timeout=settings.SENTIMENT_SERVER_BATCH_TIMEOUT)
+    return get_analyzer().predict_batch(texts)
+
+
+def preload(forked=False):
+    """
+    Load the model ahead of the first request (see gunicorn.conf.py).
+
+    In the master process (forked=False) only the fp32 torch backend is
+    loaded, so forked workers share its weights copy-on-write; the
+    scheduler's worker thread is only started on first submit, i.e. after
+    the fork. The quantized and onnx backends start native thread pools
+    while loading that don't survive a fork (the child's first forward pass
+    hangs), so each worker builds its own once forked (forked=True).
+    Nothing is loaded when inference runs in a separate server process.
+    """
+    if settings.SENTIMENT_SERVER_SOCKET:
+        return None
+    if not forked and settings.SENTIMENT_BACKEND != 'torch':
+        return None
+    return get_analyzer()
+
+
+def stats():
+    """
+    This process's effective inference configuration and cache counters, for
+    the internal stats endpoint. Never loads the model.
+    """
+    data = {
+        'pid': os.getpid(),
+        'mode': 'remote' if settings.SENTIMENT_SERVER_SOCKET else 'local',
+        'backend': settings.SENTIMENT_BACKEND,
+        'model_version': get_model_version(),
+        'loaded': _analyzer is not None,
+        'threads': {
+            'cpus': available_cpus(),
+            'configured': _threads,
+            'torch_intra_op': torch.get_num_threads(),
+            'torch_inter_op': torch.get_num_interop_threads(),
+            'onnx_intra_op': settings.SENTIMENT_ONNX_INTRA_OP_THREADS or (_threads or {}).get('intra_op', 0),
+            'onnx_inter_op': settings.SENTIMENT_ONNX_INTER_OP_THREADS,
+        },
+        'batching': {
+            'max_batch_size': settings.SENTIMENT_BATCH_MAX_SIZE,
+            'max_wait_ms': settings.SENTIMENT_BATCH_WINDOW_MS,
+        },
+    }
+    if _analyzer is not None:
+        data['model_version'] = _analyzer.model_version
+        data['cache'] = {
+            'hits': _analyzer.hits,
+            'misses': _analyzer.misses,
+            'size': len(_analyzer._lru),
+            'max_size': _analyzer.max_size,
+        }
+    return data
@@ -1,3 +1,281 @@
-from django.test import TestCase
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
 
-# Create your tests here.
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+from transformers import PreTrainedTokenizerFast, XLMRobertaConfig, XLMRobertaForSequenceClassification
+import torch
+
+from . import service
+from .batching import BatchScheduler
+from .client import RemoteSentimentClient
+from .management.commands.run_sentiment_server import SentimentServer
+from .model_loader import SentimentAnalyzer
+
+WORDS = "i am happy sad today was good bad day feel tired great nimefurahi leo siku mbaya nzuri".split()
+
+
+def tiny_tokenizer():
+    # Word-level fast tokenizer built in memory, so tests never touch the hub
+    vocab = {'<s>': 0, '<pad>': 1, '</s>': 2, '<unk>': 3}
+    for word in WORDS:
+        vocab.setdefault(word, len(vocab))
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token='<unk>'))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single='<s> $A </s>', special_tokens=[('<s>', 0), ('</s>', 2)]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token='<s>', eos_token='</s>', unk_token='<unk>',
+        pad_token='<pad>', cls_token='<s>', sep_token='</s>', model_max_length=512
+    )
+
+
+def tiny_analyzer(**kwargs):
+    torch.manual_seed(0)
+    config = XLMRobertaConfig(
+        vocab_size=len(WORDS) + 4, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=520, num_labels=3
+    )
+    return SentimentAnalyzer(
+        model=XLMRobertaForSequenceClassification(config), tokenizer=tiny_tokenizer(), **kwargs
+    )
+
+
+class SentimentAnalyzerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.analyzer = tiny_analyzer()
+
+    def assertSameResult(self, actual, expected):
+        self.assertEqual(actual['label'], expected['label'])
+        for label, probability in expected['probabilities'].items():
+            self.assertAlmostEqual(actual['probabilities'][label], probability, places=5)
+
+    def test_batch_results_keep_input_order(self):
+        # Lengths chosen so the length-sorted buckets interleave the inputs
+        texts = [
+            'happy ' * 40, 'sad', 'good day ' * 3, 'tired', 'great ' * 90,
+            'i feel bad today', 'leo siku nzuri ' * 12, 'am',
+        ]
+        results = self.analyzer.predict_batch(texts, batch_size=3)
+
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            self.assertSameResult(result, self.analyzer.predict_batch([text])[0])
+            self.assertEqual(result['model_version'], self.analyzer.model_version)
+
+    def test_long_entries_are_scored_as_overlapping_windows(self):
+        long_text = 'i feel happy today ' * 300
+        texts = ['good day', long_text, 'sad']
+        _, owners, lengths = self.analyzer.tokenization.encode(texts)
+        self.assertEqual(owners.count(0), 1)
+        self.assertGreater(owners.count(1), 2)
+        self.assertEqual(owners.count(2), 1)
+        self.assertTrue(all(length <= SentimentAnalyzer.MAX_LENGTH for length in lengths))
+
+        # The long entry's result is its windows' probabilities, weighted by length
+        windows, _, window_lengths = self.analyzer.tokenization.encode([long_text])
+        probabilities = [self.analyzer._forward([window])[0] for window in windows]
+        expected = [
+            sum(p[label] * n for p, n in zip(probabilities, window_lengths)) / sum(window_lengths)
+            for label in range(len(SentimentAnalyzer.LABELS))
+        ]
+
+        results = self.analyzer.predict_batch(texts, batch_size=2)
+        self.assertEqual(len(results), 3)
+        for label, probability in zip(SentimentAnalyzer.LABELS, expected):
+            self.assertAlmostEqual(results[1]['probabilities'][label], probability, places=5)
+        self.assertSameResult(results[0], self.analyzer.predict_batch(['good day'])[0])
+        self.assertSameResult(results[2], self.analyzer.predict_batch(['sad'])[0])
+
+    def test_without_chunking_long_entries_are_truncated(self):
+        analyzer = tiny_analyzer(chunking=False)
+        _, owners, lengths = analyzer.tokenization.encode(['i feel happy today ' * 300])
+        self.assertEqual(owners, [0])
+        self.assertEqual(lengths, [SentimentAnalyzer.MAX_LENGTH])
+        self.assertEqual(len(analyzer.predict_batch(['i feel happy today ' * 300])), 1)
+
+
+class StubAnalyzer:
+    """Labels every text 'positive'; can be held mid-batch or made to fail."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def predict_batch(self, texts, batch_size=None):
+        self.calls.append(list(texts))
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return [{'label': 'positive', 'text': text} for text in texts]
+
+
+class BatchSchedulerTests(SimpleTestCase):
+    def hold(self, scheduler, analyzer):
+        # Occupy the worker with one batch so later submits queue up behind it
+        analyzer.release.clear()
+        future = scheduler.submit('first')
+        self.assertTrue(analyzer.started.wait(5))
+        return future
+
+    def test_lone_request_runs_at_once(self):
+        analyzer = StubAnalyzer()
+        scheduler = BatchScheduler(analyzer, max_wait_ms=2000)
+        started = time.monotonic()
+        self.assertEqual(scheduler.predict('alone')['text'], 'alone')
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_queued_requests_are_coalesced(self):
+        analyzer = StubAnalyzer()
+        scheduler = BatchScheduler(analyzer, max_batch_size=3, max_wait_ms=10)
+        first = self.hold(scheduler, analyzer)
+        futures = [scheduler.submit(f'text {i}') for i in range(5)]
+        analyzer.release.set()
+
+        self.assertEqual(first.result(5)['text'], 'first')
+        self.assertEqual([f.result(5)['text'] for f in futures], [f'text {i}' for i in range(5)])
+        self.assertEqual([len(call) for call in analyzer.calls], [1, 3, 2])
+
+    def test_errors_reach_every_caller(self):
+        analyzer = StubAnalyzer(error=RuntimeError('model broke'))
+        scheduler = BatchScheduler(analyzer)
+        first = self.hold(scheduler, analyzer)
+        futures = [scheduler.submit(f'text {i}') for i in range(3)]
+        analyzer.release.set()
+
+        for future in [first] + futures:
+            with self.assertRaisesMessage(RuntimeError, 'model broke'):
+                future.result(5)
+        with self.assertLogs('journal_sentiment.batching', 'ERROR'):
+            self.assertEqual(scheduler.predict_sentiment('text'), 'neutral')
+
+    def test_cancelled_requests_are_skipped(self):
+        analyzer = StubAnalyzer()
+        scheduler = BatchScheduler(analyzer, max_wait_ms=10)
+        self.hold(scheduler, analyzer)
+        cancelled = scheduler.submit('cancelled')
+        kept = scheduler.submit('kept')
+        self.assertTrue(cancelled.cancel())
+        analyzer.release.set()
+
+        self.assertEqual(kept.result(5)['text'], 'kept')
+        self.assertEqual(analyzer.calls, [['first'], ['kept']])
+
+    def test_stuck_worker_times_out(self):
+        analyzer = StubAnalyzer()
+        scheduler = BatchScheduler(analyzer, timeout=0.1)
+        self.hold(scheduler, analyzer)
+        with self.assertLogs('journal_sentiment.batching', 'ERROR'):
+            self.assertIsNone(scheduler.predict('waiting'))
+        analyzer.release.set()
+
+
+@override_settings(SENTIMENT_SERVER_SOCKET=None)
+class PreloadTests(SimpleTestCase):
+    @mock.patch.object(service, 'get_analyzer')
+    def test_only_fp32_torch_is_loaded_before_fork(self, get_analyzer):
+        for backend, master, worker in (('torch', True, True), ('quantized', False, True), ('onnx', False, True)):
+            with self.subTest(backend=backend), override_settings(SENTIMENT_BACKEND=backend):
+                get_analyzer.reset_mock()
+                service.preload()
+                self.assertEqual(get_analyzer.called, master)
+                service.preload(forked=True)
+                self.assertEqual(get_analyzer.called, worker)
+
+
+class RecordingScheduler:
+    """Server-side stand-in for the batch scheduler: records every request."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+
+    def predict_batch(self, texts):
+        self.calls.append(list(texts))
+        if texts == ['boom']:
+            raise ValueError('boom')
+        time.sleep(self.delay)
+        return [{'label': 'positive', 'text': text} for text in texts]
+
+
+class TrackingServer(SentimentServer):
+    # Keeps accepted connections so a test can drop them like a restart would
+    def get_request(self):
+        conn, address = super().get_request()
+        self.connections.append(conn)
+        return conn, address
+
+    def handle_error(self, request, client_address):
+        # Replies to clients that already hung up are expected here
+        pass
+
+
+class RemoteClientTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.socket_path = os.path.join(directory, 'sentiment.sock')
+        self.scheduler = RecordingScheduler(delay=0.3)
+        self.server = self.start_server(self.scheduler)
+        self.client = RemoteSentimentClient(self.socket_path, timeout=5)
+        self.addCleanup(self.client._close)
+
+    def start_server(self, scheduler):
+        server = TrackingServer(self.socket_path, scheduler)
+        server.connections = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(self.stop_server, server)
+        return server
+
+    def stop_server(self, server):
+        server.shutdown()
+        server.server_close()
+        for conn in server.connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed by its handler
+            conn.close()
+
+    def test_round_trip(self):
+        results = self.client.predict_batch(['good day', 'bad day'])
+        self.assertEqual([result['text'] for result in results], ['good day', 'bad day'])
+        self.assertEqual(self.scheduler.calls, [['good day', 'bad day']])
+
+    def test_server_error_fails_the_score(self):
+        with self.assertLogs('journal_sentiment.client', 'ERROR'):
+            self.assertIsNone(self.client.predict('boom'))
+        self.assertEqual(self.client.predict_sentiment('fine'), 'positive')
+
+    def test_restarted_server_is_reconnected_once(self):
+        self.client.predict_batch(['before'])
+        self.stop_server(self.server)
+        os.unlink(self.socket_path)
+        restarted = RecordingScheduler()
+        server = self.start_server(restarted)
+
+        self.assertEqual(self.client.predict_batch(['after'])[0]['text'], 'after')
+        self.assertEqual(restarted.calls, [['after']])
+        self.assertEqual(len(server.connections), 1)
+
+    def test_timed_out_request_is_not_resent(self):
+        client = RemoteSentimentClient(self.socket_path, timeout=0.1)
+        self.addCleanup(client._close)
+        with self.assertRaises(TimeoutError):
+            client.predict_batch(['slow'])
+        # Give a resend time to arrive
+        time.sleep(0.4)
+        self.assertEqual(self.scheduler.calls, [['slow']])
@@ -0,0 +1,39 @@
+class TokenizationStage:
+    """
+    Turns texts into unpadded model inputs ahead of the forward pass.
+
+    All texts of a call are encoded in one batch call, which a fast (Rust)
+    tokenizer spreads across its own threads. Encodings aren't cached here:
+    texts only reach this stage after missing CachedSentimentAnalyzer's
+    result cache, so a token cache behind it would never be hit.
+
+    `encode` returns one entry per model window: with `stride` set, texts
+    longer than `max_length` tokens become several overlapping windows
+    (fast tokenizers only).
+    """
+
+    def __init__(self, tokenizer, max_length=512, stride=0):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.stride = stride if tokenizer.is_fast else 0
+
+    def encode(self, texts):
+        """
+        Returns (features, owners, lengths): the unpadded inputs of every
+        window, the index of the text each window belongs to, and each
+        window's token count for length bucketing.
+        """
+        texts = list(texts)
+        encodings = self.tokenizer(
+            texts,
+            padding=False,
+            truncation=True,
+            max_length=self.max_length,
+            stride=self.stride,
+            return_overflowing_tokens=bool(self.stride)
+        )
+        owners = encodings.pop('overflow_to_sample_mapping', None) or list(range(len(texts)))
+        keys = list(encodings.keys())
+        features = [{key: encodings[key][w] for key in keys} for w in range(len(owners))]
+        lengths = [len(window['input_ids']) for window in features]
+        return features, list(owners), lengths
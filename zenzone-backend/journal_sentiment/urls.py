@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('stats/', views.SentimentStatsView.as_view(), name='sentiment-stats'),
+]
@@ -1,3 +1,13 @@
-from django.shortcuts import render
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from . import service
+
+
+class SentimentStatsView(APIView):
+    """Effective inference settings of the worker that served the request (staff only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(service.stats())
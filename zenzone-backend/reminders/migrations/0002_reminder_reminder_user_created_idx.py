@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 12:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reminders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['user', '-created_at'], name='reminder_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 12:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reminders', '0002_reminder_reminder_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['user', 'updated_at'], name='reminder_user_updated_idx'),
+        ),
+    ]
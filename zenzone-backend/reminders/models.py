@@ -16,6 +16,10 @@ class Reminder(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='reminder_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='reminder_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s {self.type} reminder at {self.time}"
\ No newline at end of file
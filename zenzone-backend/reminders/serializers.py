@@ -4,5 +4,5 @@ from .models import Reminder
 class ReminderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Reminder
-        fields = ['id', 'title', 'type', 'time', 'days', 'is_active', 'created_at']
-        read_only_fields = ['created_at']
\ No newline at end of file
+        fields = ['id', 'title', 'type', 'time', 'days', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
@@ -1,3 +1,37 @@
+from datetime import time
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from .models import Reminder
+
+
+class ReminderListTests(TestCase):
+    def test_list_pages(self):
+        user = User.objects.create_user(email='paged@example.com', username='paged', password='pw')
+        Reminder.objects.bulk_create(Reminder(user=user, title='Journal', type='APP_USAGE', time=time(9), days='[]') for _ in range(3))
+        client = APIClient()
+        client.force_authenticate(user)
+
+        first = client.get('/api/reminders/reminders/', {'page_size': 2})
+        self.assertEqual(first.status_code, 200)
+        second = client.get(first.data['next'])
+        self.assertIsNone(second.data['next'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Reminder.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN output checked against PostgreSQL plans")
+class ReminderIndexTests(TestCase):
+    def test_listing_uses_user_created_index(self):
+        user = User.objects.create_user(email='indexed@example.com', username='indexed', password='pw')
+        Reminder.objects.bulk_create(Reminder(user=user, title='Journal', type='APP_USAGE', time=time(9), days='[]') for _ in range(50))
+        with connection.cursor() as cursor:
+            # Tiny test tables would otherwise always be read sequentially
+            cursor.execute('SET LOCAL enable_seqscan = off')
 
-# Create your tests here.
+        plan = Reminder.objects.filter(user=user).order_by('-created_at').explain()
+        self.assertIn('reminder_user_created_idx', plan)
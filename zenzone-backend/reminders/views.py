@@ -2,10 +2,12 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from .models import Reminder
 from .serializers import ReminderSerializer
+from zenzone_backend.pagination import CreatedAtCursorPagination
 
 class ReminderViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = ReminderSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         return Reminder.objects.filter(user=self.request.user)
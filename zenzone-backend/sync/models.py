@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone
+from authentication.models import User
+
+
+class Tombstone(models.Model):
+    """
+    Deletion log for delta sync: one row per deleted journal entry,
+    assessment or reminder, so clients syncing `since` a watermark learn
+    which ids to drop. Pruned after SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    RESOURCES = [
+        ('journal', 'Journal entry'),
+        ('assessments', 'Assessment'),
+        ('reminders', 'Reminder'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    resource = models.CharField(max_length=20, choices=RESOURCES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'resource', 'deleted_at'], name='tombstone_user_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.resource} {self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
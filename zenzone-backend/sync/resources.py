@@ -0,0 +1,15 @@
+from assessments.models import Assessment
+from assessments.serializers import AssessmentSerializer
+from journal.models import JournalEntry
+from journal.serializers import JournalEntrySerializer
+from reminders.models import Reminder
+from reminders.serializers import ReminderSerializer
+
+# Syncable resources: URL name -> (model, serializer). Each model needs
+# `user` and an indexed `updated_at`.
+RESOURCES = {
+    'journal': (JournalEntry, JournalEntrySerializer),
+    'assessments': (Assessment, AssessmentSerializer),
+    'reminders': (Reminder, ReminderSerializer),
+}
+
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete
+
+from authentication.models import User
+from .models import Tombstone
+from .resources import RESOURCES
+
+
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    # Deleting the account removes its tombstones too; don't log its rows
+    if isinstance(origin, User) or getattr(origin, 'model', None) is User:
+        return
+    resource = next(name for name, (model, _) in RESOURCES.items() if model is sender)
+    Tombstone.objects.create(user_id=instance.user_id, resource=resource, object_id=instance.pk)
+
+
+for model, _ in RESOURCES.values():
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'sync_tombstone_{model._meta.label_lower}')
@@ -0,0 +1,139 @@
+import base64
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from journal.models import JournalEntry
+from reminders.models import Reminder
+from .models import Tombstone
+
+
+@override_settings(SYNC_PAGE_SIZE=2, SYNC_WATERMARK_LAG_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='sync@example.com', username='sync', password='pw')
+        self.entries = [
+            JournalEntry.objects.create(user=self.user, content=f'entry {i}', mood='calm') for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, url='/api/sync/journal/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_full_sync_is_paged(self):
+        first = self.sync()
+        self.assertTrue(first['reset'])
+        second = self.sync(first['next'])
+        self.assertIsNone(second['next'])
+        self.assertEqual(second['watermark'], first['watermark'])
+        ids = [row['id'] for row in first['changed'] + second['changed']]
+        self.assertEqual(sorted(ids), sorted(entry.id for entry in self.entries))
+
+    def test_paging_across_equal_timestamps(self):
+        JournalEntry.objects.filter(user=self.user).update(updated_at=timezone.now() - timedelta(minutes=1))
+        first = self.sync()
+        second = self.sync(first['next'])
+        ids = [row['id'] for row in first['changed'] + second['changed']]
+        self.assertEqual(ids, sorted(entry.id for entry in self.entries))
+
+    def test_delta_returns_changes_and_deletions(self):
+        first = self.sync()
+        watermark = self.sync(first['next'])['watermark']
+
+        edited, deleted = self.entries[0], self.entries[1]
+        edited.mood = 'happy'
+        edited.save()
+        deleted_id = deleted.id
+        deleted.delete()
+
+        delta = self.sync(since=watermark)
+        self.assertFalse(delta['reset'])
+        self.assertEqual([row['id'] for row in delta['changed']], [edited.id])
+        self.assertEqual(delta['deleted'], [deleted_id])
+        self.assertTrue(Tombstone.objects.filter(resource='journal', object_id=deleted_id).exists())
+
+    def test_naive_and_aware_since(self):
+        # Naive timestamps are read as UTC
+        since = timezone.now() - timedelta(minutes=1)
+        naive = since.astimezone(dt_timezone.utc).replace(tzinfo=None)
+        for value in (since.isoformat(), naive.isoformat()):
+            data = self.sync(since=value)
+            self.assertFalse(data['reset'])
+            self.assertEqual(len(data['changed']), 2)
+            self.assertIsNotNone(data['next'])
+
+    def test_old_watermark_resets(self):
+        since = timezone.now() - timedelta(days=365)
+        Tombstone.objects.create(user=self.user, resource='journal', object_id=999)
+        data = self.sync(since=since.isoformat())
+        self.assertTrue(data['reset'])
+        self.assertEqual(data['deleted'], [])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/sync/journal/', {'since': 'yesterday'}).status_code, 400)
+        bad_cursor = base64.urlsafe_b64encode(json.dumps(['nope', 'nope', 1]).encode()).decode()
+        for cursor in ('%%%', bad_cursor):
+            self.assertEqual(self.client.get('/api/sync/journal/', {'cursor': cursor}).status_code, 400)
+
+    def test_account_deletion_leaves_no_tombstones(self):
+        self.user.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_unknown_resource(self):
+        self.assertEqual(self.client.get('/api/sync/moods/').status_code, 404)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='export@example.com', username='export', password='pw')
+        self.entries = [
+            JournalEntry.objects.create(user=self.user, content=f'line one, "{i}"\nline two', mood='calm')
+            for i in range(3)
+        ]
+        Reminder.objects.create(user=self.user, title='Breathe', type='APP_USAGE', time='09:00', days='[]')
+        other = User.objects.create_user(email='other@example.com', username='other', password='pw')
+        JournalEntry.objects.create(user=other, content='not mine', mood='calm')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def download(self, **params):
+        response = self.client.get('/api/sync/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson(self):
+        response, body = self.download()
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([row['resource'] for row in rows], ['journal'] * 3 + ['reminders'])
+        self.assertEqual([row['id'] for row in rows[:3]], [entry.id for entry in self.entries])
+
+    def test_csv(self):
+        response, body = self.download(output='csv')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row['content'] for row in rows], [entry.content for entry in self.entries])
+
+    def test_gzip(self):
+        for output in ('ndjson', 'csv'):
+            response, body = self.download(output=output, resources='journal', gzip='true')
+            self.assertEqual(response['Content-Type'], 'application/gzip')
+            self.assertIn(f'.{output}.gz', response['Content-Disposition'])
+            _, plain = self.download(output=output, resources='journal')
+            self.assertEqual(gzip.decompress(body), plain)
+
+    def test_invalid_parameters(self):
+        for params in ({'output': 'xml'}, {'resources': 'moods'}, {'output': 'csv', 'resources': 'journal,reminders'}):
+            self.assertEqual(self.client.get('/api/sync/export/', params).status_code, 400)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('export/', views.ExportView.as_view(), name='export'),
+    path('<str:resource>/', views.DeltaSyncView.as_view(), name='delta-sync'),
+]
@@ -0,0 +1,148 @@
+import base64
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from . import export
+from .models import Tombstone
+from .resources import RESOURCES
+
+
+def parse_timestamp(value):
+    timestamp = parse_datetime(value)
+    if timestamp is not None and timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
+    return timestamp
+
+
+def encode_cursor(watermark, updated_at, pk):
+    data = json.dumps([watermark.isoformat(), updated_at.isoformat(), pk])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    watermark, updated_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    watermark, updated_at = parse_timestamp(watermark), parse_timestamp(updated_at)
+    if watermark is None or updated_at is None:
+        raise ValueError("Invalid cursor timestamp")
+    return watermark, updated_at, int(pk)
+
+
+class DeltaSyncView(APIView):
+    """
+    GET /api/sync/<resource>/?since=<watermark>
+
+    Returns the user's `resource` rows changed since the watermark (all rows
+    without one) and the ids deleted since then. While `next` is set, fetch
+    it for the rest of the changes; the last page's `watermark` is the
+    `since` for the following sync. If `reset` is true the watermark was
+    older than the deletion log, and the client should replace its copy with
+    the rows returned. Rows near the watermark may be sent twice, so apply
+    them as upserts.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, resource):
+        if resource not in RESOURCES:
+            return Response({'error': 'Unknown resource'}, status=status.HTTP_404_NOT_FOUND)
+        model, serializer_class = RESOURCES[resource]
+
+        since = request.query_params.get('since')
+        if since:
+            since = parse_timestamp(since)
+            if since is None:
+                return Response({'error': 'Invalid since'}, status=status.HTTP_400_BAD_REQUEST)
+        horizon = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        reset = not since or since < horizon
+
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                watermark, after_updated_at, after_id = decode_cursor(cursor)
+            except (ValueError, TypeError):
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            # Rows committing around now can carry slightly older timestamps,
+            # so the next sync starts a little before this one
+            watermark = timezone.now() - timedelta(seconds=settings.SYNC_WATERMARK_LAG_SECONDS)
+
+        rows = model.objects.filter(user=request.user).order_by('updated_at', 'id')
+        if not reset:
+            rows = rows.filter(updated_at__gte=since)
+        if cursor:
+            rows = rows.filter(updated_at__gte=after_updated_at).exclude(
+                updated_at=after_updated_at, id__lte=after_id
+            )
+        rows = list(rows[:settings.SYNC_PAGE_SIZE + 1])
+
+        next_url = None
+        if len(rows) > settings.SYNC_PAGE_SIZE:
+            rows = rows[:settings.SYNC_PAGE_SIZE]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor',
+                encode_cursor(watermark, rows[-1].updated_at, rows[-1].pk)
+            )
+
+        deleted = []
+        if not reset and not cursor:
+            deleted = list(
+                Tombstone.objects.filter(user=request.user, resource=resource, deleted_at__gte=since)
+                .values_list('object_id', flat=True)
+            )
+
+        return Response({
+            'resource': resource,
+            'reset': reset,
+            'changed': serializer_class(rows, many=True).data,
+            'deleted': deleted,
+            'next': next_url,
+            'watermark': watermark.isoformat(),
+        })
+
+
+class ExportView(APIView):
+    """
+    GET /api/sync/export/?output=ndjson|csv&resources=journal,assessments,reminders&gzip=true
+
+    Streams the user's data as a download. NDJSON covers any set of
+    resources (each line tagged with its resource); CSV covers a single
+    resource, journal entries by default.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in ('ndjson', 'csv'):
+            return Response({'error': 'output must be ndjson or csv'}, status=status.HTTP_400_BAD_REQUEST)
+        default = 'journal' if output == 'csv' else ','.join(RESOURCES)
+        resources = [r for r in request.query_params.get('resources', default).split(',') if r]
+        if not resources or any(r not in RESOURCES for r in resources):
+            return Response({'error': 'Unknown resource'}, status=status.HTTP_400_BAD_REQUEST)
+        if output == 'csv' and len(resources) != 1:
+            return Response({'error': 'CSV exports one resource at a time'}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.query_params.get('gzip', '').lower() in ('true', '1', 'yes')
+
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        if output == 'csv':
+            pieces = export.iter_csv(request.user, resources[0], chunk_size)
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            pieces = export.iter_ndjson(request.user, resources, chunk_size)
+            content_type = 'application/x-ndjson; charset=utf-8'
+
+        filename = f"zenzone-{'-'.join(resources)}-{timezone.now():%Y%m%d}.{output}"
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        response = StreamingHttpResponse(export.buffered(pieces, compress), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -4,15 +4,17 @@ from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
 from openai import OpenAI
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ChatView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
         try:
-            print("Received chat request from:", request.user.username)
-            print("Request data:", request.data)
-            
+            logger.debug("Received chat request from user %s", request.user.pk)
+
             message = request.data.get('message')
             if not message:
                 return Response(
@@ -22,7 +24,6 @@ class ChatView(APIView):
 
             # Initialize OpenAI client
             client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            print("OpenAI client initialized")
 
             try:
                 # System message to guide the model's behavior
@@ -37,7 +38,6 @@ class ChatView(APIView):
                 7. Recognize signs of crisis and provide appropriate crisis resources"""
 
                 # Create the conversation with new API
-                print("Sending request to OpenAI")
                 response = client.chat.completions.create(
                     model="gpt-4",
                     messages=[
@@ -47,11 +47,10 @@ class ChatView(APIView):
                     temperature=0.7,
                     max_tokens=500
                 )
-                print("Received response from OpenAI")
 
                 # Extract the response
                 ai_response = response.choices[0].message.content
-                print("AI Response length:", len(ai_response))
+                logger.debug("OpenAI response of %d chars", len(ai_response))
 
                 # Check for crisis keywords
                 crisis_keywords = ['suicide', 'kill', 'die', 'hurt', 'harm', 'end my life']
@@ -70,14 +69,14 @@ class ChatView(APIView):
                 return Response({'response': ai_response})
                 
             except Exception as openai_error:
-                print("OpenAI Error:", str(openai_error))
+                logger.warning("OpenAI Error: %s", openai_error)
                 return Response(
                     {'error': f'OpenAI Error: {str(openai_error)}'}, 
                     status=503
                 )
 
         except Exception as e:
-            print("General Error:", str(e))
+            logger.exception("Error handling chat request")
             return Response(
                 {'error': str(e)}, 
                 status=500
@@ -0,0 +1,70 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through only a fraction (`rate`) of records below `min_level`, so
+    per-request diagnostics can stay enabled under load. Warnings and errors
+    are never dropped.
+    """
+
+    def __init__(self, rate=1.0, min_level='WARNING'):
+        super().__init__()
+        self.rate = float(rate)
+        self.min_level = logging.getLevelName(min_level) if isinstance(min_level, str) else min_level
+
+    def filter(self, record):
+        if record.levelno >= self.min_level or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class NonBlockingStreamHandler(QueueHandler):
+    """
+    Hands records to a background thread that writes them to `stream`, so
+    request threads never wait on stdout/stderr. The listener is (re)started
+    lazily per process, which keeps it working in workers forked from a
+    preloading master.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.stream = stream or sys.stderr
+        self._pid = None
+        self._listener = None
+        self._start_lock = threading.Lock()
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # A listener inherited through fork has no thread in this process
+            self.queue = queue.SimpleQueue()
+            self._listener = QueueListener(self.queue, logging.StreamHandler(self.stream))
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def _stop_listener(self):
+        # Flushes queued records on shutdown
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def close(self):
+        self._stop_listener()
+        super().close()
@@ -0,0 +1,19 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination for per-user histories, newest first. Pages are located
+    by an opaque cursor instead of an offset, so every page costs the same
+    index range scan and no COUNT(*) is run. The id tie-break keeps ordering
+    stable between rows created in the same instant.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class DateTakenCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-date_taken', '-id')
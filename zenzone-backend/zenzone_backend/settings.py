@@ -24,11 +24,86 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# Sentiment inference: concurrent journal saves are coalesced into one
+# forward pass of up to SENTIMENT_BATCH_MAX_SIZE entries. When several are
+# already queued, the batch waits at most SENTIMENT_BATCH_WINDOW_MS to fill;
+# a lone request runs straight away.
+SENTIMENT_BATCH_MAX_SIZE = int(os.getenv('SENTIMENT_BATCH_MAX_SIZE', 32))
+SENTIMENT_BATCH_WINDOW_MS = float(os.getenv('SENTIMENT_BATCH_WINDOW_MS', 10))
+# Seconds a request waits for its score before saving the entry as failed.
+SENTIMENT_PREDICT_TIMEOUT = float(os.getenv('SENTIMENT_PREDICT_TIMEOUT', 30))
+# Path of the Unix socket served by `manage.py run_sentiment_server`. When set,
+# web workers send texts to that process instead of loading the model.
+SENTIMENT_SERVER_SOCKET = os.getenv('SENTIMENT_SERVER_SOCKET') or None
+SENTIMENT_SERVER_TIMEOUT = float(os.getenv('SENTIMENT_SERVER_TIMEOUT', 30))
+# Timeout for one large request such as a bulk import's single scoring call.
+SENTIMENT_SERVER_BATCH_TIMEOUT = float(os.getenv('SENTIMENT_SERVER_BATCH_TIMEOUT', 300))
+# Entries longer than the model's 512-token window are scored as overlapping
+# windows and averaged instead of being truncated.
+SENTIMENT_CHUNKING = os.getenv('SENTIMENT_CHUNKING', 'True').lower() in ('true', '1', 'yes')
+# When enabled, journal entries are saved with sentiment_status='pending' and
+# scored in the background instead of inside the request.
+SENTIMENT_ASYNC = os.getenv('SENTIMENT_ASYNC', 'False').lower() in ('true', '1', 'yes')
+# 'torch' (fp32), 'quantized' (dynamic int8, CPU only; build the artifact
+# with `manage.py quantize_sentiment_model`) or 'onnx' (onnxruntime; build
+# with `manage.py export_sentiment_onnx`). 0 threads = onnxruntime default.
+SENTIMENT_BACKEND = os.getenv('SENTIMENT_BACKEND', 'torch')
+SENTIMENT_ONNX_INTRA_OP_THREADS = int(os.getenv('SENTIMENT_ONNX_INTRA_OP_THREADS', 0))
+SENTIMENT_ONNX_INTER_OP_THREADS = int(os.getenv('SENTIMENT_ONNX_INTER_OP_THREADS', 0))
+# Torch intra-op / inter-op threads per inference process, so several workers
+# on one host don't each grab every core. 'auto' gives each of the host's
+# SENTIMENT_PROCESSES_PER_HOST processes (gunicorn's WEB_CONCURRENCY by
+# default) an equal share of the cores; 0 keeps torch's default. The onnx
+# backend uses the same intra-op count unless SENTIMENT_ONNX_* is set.
+SENTIMENT_TORCH_THREADS = os.getenv('SENTIMENT_TORCH_THREADS', 'auto')
+SENTIMENT_TORCH_INTEROP_THREADS = os.getenv('SENTIMENT_TORCH_INTEROP_THREADS', '1')
+SENTIMENT_PROCESSES_PER_HOST = int(
+    os.getenv('SENTIMENT_PROCESSES_PER_HOST') or os.getenv('WEB_CONCURRENCY', 2)
+)
+# Offline model bundle (config, tokenizer, safetensors weights) built with
+# `manage.py build_sentiment_bundle`. Used instead of the Hugging Face hub and
+# sentiment_model.pth whenever the directory exists.
+SENTIMENT_MODEL_BUNDLE = os.getenv(
+    'SENTIMENT_MODEL_BUNDLE',
+    str(Path(__file__).resolve().parent.parent / 'journal_sentiment' / 'models' / 'bundle')
+)
+# Identifies the deployed weights; part of every sentiment cache key. Defaults
+# to the bundle's version, or SentimentAnalyzer.MODEL_VERSION without a bundle.
+SENTIMENT_MODEL_VERSION = os.getenv('SENTIMENT_MODEL_VERSION') or None
+# Results are cached by normalized content hash in a per-process LRU of
+# SENTIMENT_CACHE_SIZE entries, and additionally in the Django cache named by
+# SENTIMENT_CACHE_ALIAS when set (e.g. 'default').
+SENTIMENT_CACHE_SIZE = int(os.getenv('SENTIMENT_CACHE_SIZE', 10000))
+SENTIMENT_CACHE_ALIAS = os.getenv('SENTIMENT_CACHE_ALIAS') or None
+SENTIMENT_CACHE_TIMEOUT = int(os.getenv('SENTIMENT_CACHE_TIMEOUT', 60 * 60 * 24 * 7))
+# Per-user analytics responses are cached (and served with an ETag) in the
+# Django cache named by ANALYTICS_CACHE_ALIAS when set. With several web
+# workers this must be a cache they share, e.g. CACHE_BACKEND=
+# django.core.cache.backends.redis.RedisCache, or workers serve stale data.
+ANALYTICS_CACHE_ALIAS = os.getenv('ANALYTICS_CACHE_ALIAS') or None
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', 60 * 60))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     )
 }
+# History endpoints (journal entries, assessments, reminders) are cursor
+# paginated; clients may ask for up to API_MAX_PAGE_SIZE rows with ?page_size=.
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 20))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+# Largest number of entries, and of body bytes, accepted by one
+# POST /api/journal/entries/bulk/.
+JOURNAL_IMPORT_MAX_ENTRIES = int(os.getenv('JOURNAL_IMPORT_MAX_ENTRIES', 1000))
+JOURNAL_IMPORT_MAX_BYTES = int(os.getenv('JOURNAL_IMPORT_MAX_BYTES', 10 * 1024 * 1024))
+# Delta sync (/api/sync/<resource>/): rows per page, how far before "now" each
+# returned watermark is set to cover in-flight transactions, and how long
+# deletions are remembered (older watermarks get a full resync).
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', 500))
+SYNC_WATERMARK_LAG_SECONDS = int(os.getenv('SYNC_WATERMARK_LAG_SECONDS', 5))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 90))
+# Rows fetched per server-side cursor round trip by /api/sync/export/.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -78,6 +153,7 @@ INSTALLED_APPS = [
     'assessments',
     'reminders',
     'zenchat',
+    'sync',
 
 
 ]
@@ -138,6 +214,63 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Logging
+# Records go through a queue to a background writer thread, so request threads
+# never block on stdout. Per-app levels are set with <APP>_LOG_LEVEL env vars;
+# records below WARNING are sampled at LOG_SAMPLE_RATE (0.0-1.0).
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {
+            'format': '%(asctime)s %(levelname)s %(name)s [pid %(process)d] %(message)s',
+        },
+    },
+    'filters': {
+        'sampled': {
+            '()': 'zenzone_backend.log_handlers.SamplingFilter',
+            'rate': float(os.getenv('LOG_SAMPLE_RATE', 1.0)),
+        },
+    },
+    'handlers': {
+        'queued_console': {
+            '()': 'zenzone_backend.log_handlers.NonBlockingStreamHandler',
+            'formatter': 'standard',
+            'filters': ['sampled'],
+        },
+    },
+    'root': {
+        'handlers': ['queued_console'],
+        'level': os.getenv('LOG_LEVEL', 'WARNING'),
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queued_console'],
+            'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'journal_sentiment': {
+            'level': os.getenv('JOURNAL_SENTIMENT_LOG_LEVEL', 'INFO'),
+        },
+        'journal': {
+            'level': os.getenv('JOURNAL_LOG_LEVEL', 'INFO'),
+        },
+        'assessments': {
+            'level': os.getenv('ASSESSMENTS_LOG_LEVEL', 'INFO'),
+        },
+        'zenchat': {
+            'level': os.getenv('ZENCHAT_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -8,4 +8,6 @@ urlpatterns = [
     path('api/assessments/', include('assessments.urls')),
     path('api/reminders/', include('reminders.urls')),
     path('api/zenchat/', include('zenchat.urls')),
+    path('api/sentiment/', include('journal_sentiment.urls')),
+    path('api/sync/', include('sync.urls')),
 ]
\ No newline at end of file
@@ -11,7 +11,8 @@ import {
   ScrollView,
   TouchableOpacity,
   SafeAreaView,
-  ActivityIndicator
+  ActivityIndicator,
+  Alert
 } from 'react-native';
 import { Feather, MaterialCommunityIcons } from '@expo/vector-icons';
 
@@ -20,6 +21,9 @@ const JournalHistoryScreen = ({ navigation }) => {
   // Add state for journal entries
   const [journalEntries, setJournalEntries] = useState([]);
   const [loading, setLoading] = useState(true);
+  // URL of the next (older) page of entries, if any
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useFocusEffect(
     React.useCallback(() => {
@@ -39,8 +43,9 @@ const JournalHistoryScreen = ({ navigation }) => {
             return;
         }
 
-        const entries = await API.getJournalEntries(token);
-        setJournalEntries(entries);
+        const page = await API.getJournalEntries(token);
+        setJournalEntries(page.results);
+        setNextPage(page.next);
     } catch (error) {
         console.error('Error fetching entries:', error);
         if (error.message.includes('401') || error.message.includes('token')) {
@@ -57,6 +62,24 @@ const JournalHistoryScreen = ({ navigation }) => {
     }
 };
 
+  const loadMoreEntries = async () => {
+    if (!nextPage || loadingMore) {
+        return;
+    }
+    try {
+        setLoadingMore(true);
+        const token = await TokenStorage.getAccessToken();
+        const page = await API.getJournalEntries(token, nextPage);
+        setJournalEntries((entries) => [...entries, ...page.results]);
+        setNextPage(page.next);
+    } catch (error) {
+        console.error('Error fetching more entries:', error);
+        Alert.alert('Error', 'Failed to load more journal entries');
+    } finally {
+        setLoadingMore(false);
+    }
+};
+
   // Function to format date
   const formatDate = (dateString) => {
     const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
@@ -157,7 +180,7 @@ const JournalHistoryScreen = ({ navigation }) => {
   </View>
                 
                 <Text style={styles.entryPreview} numberOfLines={2}>
-                  {entry.content}
+                  {entry.excerpt}
                 </Text>
                 
                 <View style={styles.entryFooter}>
@@ -167,6 +190,15 @@ const JournalHistoryScreen = ({ navigation }) => {
               </TouchableOpacity>
             ))
           )}
+          {!loading && nextPage && (
+            <TouchableOpacity style={styles.loadMoreButton} onPress={loadMoreEntries}>
+              {loadingMore ? (
+                <ActivityIndicator color="#007AFF" />
+              ) : (
+                <Text style={styles.readMore}>Load Older Entries</Text>
+              )}
+            </TouchableOpacity>
+          )}
         </View>
       </ScrollView>
 
@@ -294,6 +326,11 @@ const styles = StyleSheet.create({
     color: '#007AFF',
     marginRight: 5,
   },
+  loadMoreButton: {
+    alignItems: 'center',
+    paddingVertical: 15,
+    marginBottom: 80,
+  },
   bottomNav: {
     position: 'absolute',
     bottom: 6,
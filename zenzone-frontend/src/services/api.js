@@ -191,10 +191,13 @@ export const API = {
         }
     },
 
-    getJournalEntries: async (token) => {
+    // Returns one page of entry previews (excerpt instead of the full content):
+    // { results, next, previous }. Pass `next` back as `url` to load older
+    // entries; getJournalEntry returns the full entry.
+    getJournalEntries: async (token, url = `${BASE_URL}/journal/entries/previews/`) => {
         try {
             console.log('Using token:', token); // Debug log
-            const response = await fetch(`${BASE_URL}/journal/entries/`, {
+            const response = await fetch(url, {
                 headers: {
                     'Authorization': `Bearer ${token}`,
                     'Content-Type': 'application/json',
@@ -209,7 +212,7 @@ export const API = {
                     await TokenStorage.storeTokens(newTokens);
                     
                     // Retry with new token
-                    const retryResponse = await fetch(`${BASE_URL}/journal/entries/`, {
+                    const retryResponse = await fetch(url, {
                         headers: {
                             'Authorization': `Bearer ${newTokens.access}`,
                             'Content-Type': 'application/json',
@@ -334,26 +337,33 @@ export const API = {
         try {
             console.log('Attempting to fetch assessment history...');
             console.log('Using token:', token ? 'Token present' : 'No token');
-            console.log('Fetch URL:', `${BASE_URL}/assessments/history/`);
 
-            const response = await fetch(`${BASE_URL}/assessments/history/`, {
-                method: 'GET',
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json',
+            // The history is paginated; follow the pages to get every assessment
+            let url = `${BASE_URL}/assessments/history/?page_size=100`;
+            const data = [];
+            while (url) {
+                console.log('Fetch URL:', url);
+                const response = await fetch(url, {
+                    method: 'GET',
+                    headers: {
+                        'Authorization': `Bearer ${token}`,
+                        'Content-Type': 'application/json',
+                    }
+                });
+                
+                console.log('Response status:', response.status);
+                
+                if (!response.ok) {
+                    const errorText = await response.text();
+                    console.error('Error response:', errorText);
+                    throw new Error(`Failed to fetch assessment history: ${response.status}`);
                 }
-            });
-            
-            console.log('Response status:', response.status);
-            
-            if (!response.ok) {
-                const errorText = await response.text();
-                console.error('Error response:', errorText);
-                throw new Error(`Failed to fetch assessment history: ${response.status}`);
+                
+                const page = await response.json();
+                data.push(...page.results);
+                url = page.next;
             }
-            
-            const data = await response.json();
-            console.log('Successfully fetched assessment history:', data);
+            console.log('Successfully fetched assessment history:', data.length);
             return data;
         } catch (error) {
             console.error('Detailed fetch error:', error);
@@ -394,18 +404,26 @@ export const API = {
     // Add to your existing API object in api.js
     getReminders: async (token) => {
       try {
-        const response = await fetch(`${BASE_URL}/reminders/reminders/`, {
-          headers: {
-            'Authorization': `Bearer ${token}`,
-            'Content-Type': 'application/json',
+        // The list is paginated; follow the pages to get every reminder
+        let url = `${BASE_URL}/reminders/reminders/?page_size=100`;
+        const reminders = [];
+        while (url) {
+          const response = await fetch(url, {
+            headers: {
+              'Authorization': `Bearer ${token}`,
+              'Content-Type': 'application/json',
+            }
+          });
+          
+          if (!response.ok) {
+            throw new Error('Failed to fetch reminders');
           }
-        });
-        
-        if (!response.ok) {
-          throw new Error('Failed to fetch reminders');
+          
+          const page = await response.json();
+          reminders.push(...page.results);
+          url = page.next;
         }
-        
-        return await response.json();
+        return reminders;
       } catch (error) {
         console.error('Error fetching reminders:', error);
         throw error;